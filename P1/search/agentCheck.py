@@ -0,0 +1,68 @@
+# agentCheck.py
+# -------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to
+# http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Smoke check of the search agents in searchAgents.py.
+
+Builds SearchAgent and every subclass of it the way pacman.py does when no -a
+options are given, and plans a path on a small layout:
+
+  python agentCheck.py -l tinyCorners
+
+The autograder calls the search functions directly and never builds these
+agents, so a crash in an agent's __init__ or registerInitialState only shows
+up here or in a game.  The script exits with status 1 if any agent failed.
+"""
+
+import optparse
+import sys
+import traceback
+
+import layout
+import pacman
+import searchAgents
+
+def searchAgentClasses():
+    "SearchAgent and its subclasses defined in searchAgents.py, by name"
+    return sorted([(name, value) for name, value in vars(searchAgents).items()
+                   if isinstance(value, type(searchAgents.SearchAgent)) and issubclass(value, searchAgents.SearchAgent)])
+
+def main():
+    parser = optparse.OptionParser(usage='python agentCheck.py [options]')
+    parser.add_option('-l', '--layout', dest='layout', default='tinyCorners',
+                      help='the layout to plan on; it needs food in its corners [Default: %default]')
+    options, _ = parser.parse_args()
+
+    lay = layout.getLayout(options.layout)
+    if lay is None: raise Exception("The layout " + options.layout + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+
+    failed = []
+    for name, agentClass in searchAgentClasses():
+        try:
+            agent = agentClass()
+            agent.registerInitialState(gameState)
+            agent.getAction(gameState)
+        except Exception:
+            traceback.print_exc()
+            failed.append(name)
+        print('%-22s %s' % (name, 'FAILED' if name in failed else 'ok'))
+    if failed:
+        print('%d of the agents failed: %s' % (len(failed), ', '.join(failed)))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+# benchmark.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to
+# http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Headless benchmark of the search algorithms in search.py.
+
+Every layout is paired with the search problem it was made for: layouts with a
+single dot are PositionSearchProblems whose goal is that dot, *Corners layouts
+are CornersProblems and every other layout is a FoodSearchProblem.  Each
+problem is solved by every algorithm, and the algorithms that take a heuristic
+are run once per heuristic of the problem (and the ones that take a tieBreak
+policy once per policy given with --tieBreaks).  For every run the benchmark
+records the path cost, the number of expanded nodes, the largest fringe, the
+wall time and the peak memory, and writes them to CSV and/or JSON.
+
+Each run happens in a forked child process (where fork is available), so the
+timeout, the memory limit and the peak RSS apply to that run alone.
+
+Results can be stored as a baseline and later runs checked against it:
+
+  python benchmark.py -l tinyMaze,mediumMaze --saveBaseline
+  python benchmark.py -l tinyMaze,mediumMaze --csv results.csv
+
+A run regresses if it no longer finishes, returns a different cost, expands
+more nodes, or is slower than timeTolerance times its baseline time.  The
+script exits with status 1 if any run regressed.
+
+With several tie-breaking policies, e.g. --tieBreaks fifo,lifo,highg, a
+summary of the nodes expanded and the time taken with each policy is printed
+for every problem type, to pick the best policy per family of layouts.
+"""
+
+import cPickle
+import csv
+import json
+import optparse
+import os
+import sys
+import time
+
+import layout
+import pacman
+import search
+import searchAgents
+import util
+
+FIELDS = ['layout', 'problem', 'algorithm', 'heuristic', 'tieBreak', 'status', 'cost', 'expanded', 'maxFringe', 'seconds', 'peakRSS']
+DEFAULT_ALGORITHMS = ['bfs', 'dfs', 'ucs', 'astar']
+BASELINE = 'benchmarkBaseline.json'
+MIN_TIME_REGRESSION = 0.1 # Time differences below this many seconds are noise
+ROW_FORMAT = '%-18s %-22s %-8s %-19s %-8s %-8s %6s %9s %9s %9s %9s'
+
+def getProblem(layoutName):
+    """
+    Returns (problemName, problemFactory, heuristicNames) for a layout, where
+    problemFactory takes the starting GameState.
+    """
+    lay = layout.getLayout(layoutName)
+    if lay is None: raise Exception("The layout " + layoutName + " cannot be found")
+    food = lay.food.asList()
+    if 'Corners' in layoutName:
+        return 'CornersProblem', searchAgents.CornersProblem, ['cornersHeuristic']
+    if len(food) == 1:
+        factory = lambda gameState: searchAgents.PositionSearchProblem(gameState, goal=food[0], warn=False, visualize=False)
+        return 'PositionSearchProblem', factory, ['manhattanHeuristic', 'euclideanHeuristic']
+    return 'FoodSearchProblem', searchAgents.FoodSearchProblem, ['foodHeuristic']
+
+def getCases(layoutNames, algorithms, tieBreaks):
+    """
+    Returns the (layout, algorithm, heuristic, tieBreak) tuples to run, where
+    heuristic and tieBreak are None for algorithms that do not take them.
+    """
+    cases = []
+    for layoutName in layoutNames:
+        _, _, heuristics = getProblem(layoutName)
+        for algorithm in algorithms:
+            arguments = getattr(search, algorithm).func_code.co_varnames
+            for heuristic in 'heuristic' in arguments and heuristics or [None]:
+                for tieBreak in 'tieBreak' in arguments and tieBreaks or [None]:
+                    cases.append((layoutName, algorithm, heuristic, tieBreak))
+    return cases
+
+def emptyResult(layoutName, algorithm, heuristicName, tieBreak, status):
+    result = dict([(field, '') for field in FIELDS])
+    result.update(layout=layoutName, algorithm=algorithm, heuristic=heuristicName or '', tieBreak=tieBreak or '',
+                  status=status)
+    return result
+
+def runCase(layoutName, algorithm, heuristicName, tieBreak):
+    "Solves one case in this process and returns its result as a dictionary"
+    problemName, factory, _ = getProblem(layoutName)
+    result = emptyResult(layoutName, algorithm, heuristicName, tieBreak, 'ok')
+    result['problem'] = problemName
+    gameState = pacman.GameState()
+    gameState.initialize(layout.getLayout(layoutName), 0)
+    problem = factory(gameState)
+    function = getattr(search, algorithm)
+    options = {}
+    if heuristicName: options['heuristic'] = getattr(searchAgents, heuristicName)
+    if tieBreak: options['tieBreak'] = tieBreak
+    solve = lambda: function(problem, **options)
+
+    startTime = time.time()
+    try:
+        actions = solve()
+    except util.TimeoutFunctionException:
+        result['status'] = 'timeout'
+    except MemoryError:
+        result['status'] = 'memory'
+    else:
+        result['cost'] = problem.getCostOfActions(actions) if actions is not None else ''
+        if actions is None: result['status'] = 'unsolved'
+    result['seconds'] = round(time.time() - startTime, 4)
+    result['expanded'] = problem._expanded
+    result['maxFringe'] = getattr(problem, '_maxFringe', '')
+    try:
+        import resource
+        result['peakRSS'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pass
+    return result
+
+def runIsolated(case, timeout, memoryLimit):
+    """
+    Runs a case in a forked child limited to 'timeout' seconds and
+    'memoryLimit' megabytes, and returns its result.  Without fork the case
+    runs in this process, and peakRSS is the peak of the whole benchmark.
+    """
+    if not hasattr(os, 'fork'):
+        return util.TimeoutFunction(runCase, timeout)(*case)
+
+    readEnd, writeEnd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(readEnd)
+        try:
+            try:
+                import resource
+                limit = memoryLimit * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+            except (ImportError, ValueError):
+                pass
+            result = util.TimeoutFunction(runCase, timeout)(*case)
+        except Exception, e:
+            result = emptyResult(*(case + ('error: %s' % e,)))
+        f = os.fdopen(writeEnd, 'wb')
+        cPickle.dump(result, f, cPickle.HIGHEST_PROTOCOL)
+        f.close()
+        os._exit(0)
+
+    os.close(writeEnd)
+    f = os.fdopen(readEnd, 'rb')
+    try:
+        result = cPickle.load(f)
+    except EOFError:
+        result = emptyResult(*(case + ('crashed',)))
+    f.close()
+    os.waitpid(pid, 0)
+    return result
+
+def caseKey(result):
+    return '/'.join([str(result[field]) for field in ['layout', 'problem', 'algorithm', 'heuristic', 'tieBreak']])
+
+def checkRegressions(results, baseline, timeTolerance):
+    "Returns a list of messages describing how 'results' regressed from 'baseline'"
+    baselineByKey = dict([(caseKey(result), result) for result in baseline])
+    regressions = []
+    for result in results:
+        key = caseKey(result)
+        if key not in baselineByKey: continue
+        old = baselineByKey[key]
+        if old['status'] != 'ok':
+            continue
+        if result['status'] != 'ok':
+            regressions.append('%s: %s (was ok)' % (key, result['status']))
+            continue
+        if result['cost'] != old['cost']:
+            regressions.append('%s: cost %s (was %s)' % (key, result['cost'], old['cost']))
+        if result['expanded'] > old['expanded']:
+            regressions.append('%s: expanded %d nodes (was %d)' % (key, result['expanded'], old['expanded']))
+        if result['seconds'] > old['seconds'] * timeTolerance and result['seconds'] - old['seconds'] > MIN_TIME_REGRESSION:
+            regressions.append('%s: took %.2fs (was %.2fs)' % (key, result['seconds'], old['seconds']))
+    return regressions
+
+def printTieBreakSummary(results, tieBreaks):
+    """
+    Prints the total nodes expanded and time taken with each tieBreak policy
+    for every problem type, over the runs that every policy finished.
+    """
+    runs = {} # (problem, layout, algorithm, heuristic) -> {tieBreak: result}
+    for result in results:
+        if result['tieBreak']:
+            key = (result['problem'], result['layout'], result['algorithm'], result['heuristic'])
+            runs.setdefault(key, {})[result['tieBreak']] = result
+    totals = {} # problem -> {tieBreak: [runs, expanded, seconds]}
+    for key, byTieBreak in runs.items():
+        if [tieBreak for tieBreak in tieBreaks if byTieBreak.get(tieBreak, {}).get('status') != 'ok']: continue
+        for tieBreak in tieBreaks:
+            total = totals.setdefault(key[0], {}).setdefault(tieBreak, [0, 0, 0.0])
+            total[0] += 1
+            total[1] += byTieBreak[tieBreak]['expanded']
+            total[2] += byTieBreak[tieBreak]['seconds']
+    print
+    print '%-22s %-8s %6s %12s %10s' % ('problem', 'tieBreak', 'runs', 'expanded', 'seconds')
+    for problem in sorted(totals.keys()):
+        for tieBreak in tieBreaks:
+            print '%-22s %-8s %6d %12d %10.3f' % tuple([problem, tieBreak] + totals[problem][tieBreak])
+
+def readCommand(argv):
+    parser = optparse.OptionParser(description = 'Benchmark the search algorithms on the Pacman layouts')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated layout names (default: every layout in layouts/)')
+    parser.add_option('-a', '--algorithms', dest='algorithms', default=','.join(DEFAULT_ALGORITHMS),
+                      help='comma separated search functions from search.py (default: %default)')
+    parser.add_option('--tieBreaks', dest='tieBreaks', default='fifo',
+                      help='comma separated A* tie-breaking policies: fifo, lifo, highg, lowh (default: %default)')
+    parser.add_option('--timeout', dest='timeout', type='int', default=10,
+                      help='seconds allowed for each run (default: %default)')
+    parser.add_option('--memoryLimit', dest='memoryLimit', type='int', default=2048,
+                      help='megabytes of memory allowed for each run (default: %default)')
+    parser.add_option('--csv', dest='csvFile', default=None,
+                      help='write the results to this CSV file')
+    parser.add_option('--json', dest='jsonFile', default=None,
+                      help='write the results to this JSON file')
+    parser.add_option('--baseline', dest='baseline', default=BASELINE,
+                      help='baseline results (JSON) to check for regressions (default: %default)')
+    parser.add_option('--saveBaseline', action='store_true', dest='saveBaseline', default=False,
+                      help='store the results as the new baseline instead of checking them')
+    parser.add_option('--timeTolerance', dest='timeTolerance', type='float', default=2.0,
+                      help='how many times slower than the baseline a run may be (default: %default)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+def main(argv):
+    options = readCommand(argv)
+    if options.layouts:
+        layoutNames = options.layouts.split(',')
+    else:
+        layoutNames = sorted([name[:-4] for name in os.listdir('layouts') if name.endswith('.lay')])
+
+    tieBreaks = options.tieBreaks.split(',')
+    results = []
+    print ROW_FORMAT % tuple(FIELDS)
+    for case in getCases(layoutNames, options.algorithms.split(','), tieBreaks):
+        result = runIsolated(case, options.timeout, options.memoryLimit)
+        results.append(result)
+        print ROW_FORMAT % tuple([result[field] for field in FIELDS])
+        sys.stdout.flush()
+    if len(tieBreaks) > 1:
+        printTieBreakSummary(results, tieBreaks)
+
+    if options.csvFile:
+        f = open(options.csvFile, 'wb')
+        writer = csv.DictWriter(f, FIELDS)
+        writer.writerow(dict(zip(FIELDS, FIELDS)))
+        writer.writerows(results)
+        f.close()
+    if options.jsonFile:
+        f = open(options.jsonFile, 'w')
+        json.dump(results, f, indent=1, sort_keys=True)
+        f.close()
+
+    if options.saveBaseline:
+        baseline = []
+        if os.path.exists(options.baseline):
+            # Keep the stored runs of layouts and algorithms that were not rerun
+            rerun = set([caseKey(result) for result in results])
+            baseline = [result for result in json.load(open(options.baseline)) if caseKey(result) not in rerun]
+        f = open(options.baseline, 'w')
+        json.dump(sorted(baseline + results, key=caseKey), f, indent=1, sort_keys=True)
+        f.close()
+        print 'Baseline written to', options.baseline
+    elif os.path.exists(options.baseline):
+        regressions = checkRegressions(results, json.load(open(options.baseline)), options.timeTolerance)
+        for message in regressions:
+            print 'REGRESSION:', message
+        if regressions:
+            sys.exit(1)
+        print 'No regressions against', options.baseline
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
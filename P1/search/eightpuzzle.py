@@ -15,6 +15,10 @@
 
 import search
 import random
+import os
+import util
+from array import array
+from collections import deque
 
 # Module Classes
 
@@ -47,18 +51,24 @@ class EightPuzzleState:
             | 6 | 7 | 8 |
             ------------
 
-        The configuration of the puzzle is stored in a 2-dimensional
-        list (a list of lists) 'cells'.
+        A list of the 16 integers from 0 to 15 makes a 15-puzzle in the
+        same way, and any other square number of tiles works too.
+
+        The configuration of the puzzle is packed into the integer 'tiles',
+        4 bits per cell in row-major order: the number in cell i is
+        (tiles >> 4 * i) & 15.  Copies, comparisons and hashes are then
+        operations on a single integer.
         """
-        self.cells = []
-        numbers = numbers[:] # Make a copy so as not to cause side-effects.
-        numbers.reverse()
-        for row in range( 3 ):
-            self.cells.append( [] )
-            for col in range( 3 ):
-                self.cells[row].append( numbers.pop() )
-                if self.cells[row][col] == 0:
-                    self.blankLocation = row, col
+        self.size = int(round(len(numbers) ** 0.5))
+        self.tiles = 0
+        for i, number in enumerate(numbers):
+            self.tiles |= number << (4 * i)
+            if number == 0:
+                self.blankLocation = divmod(i, self.size)
+
+    def getCell( self, row, col ):
+        "Returns the number in the given cell (0 for the blank)"
+        return (self.tiles >> (4 * (row * self.size + col))) & 15
 
     def isGoal( self ):
         """
@@ -78,13 +88,7 @@ class EightPuzzleState:
         >>> EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).isGoal()
         False
         """
-        current = 0
-        for row in range( 3 ):
-            for col in range( 3 ):
-                if current != self.cells[row][col]:
-                    return False
-                current += 1
-        return True
+        return self.tiles == goalTiles(self.size)
 
     def legalMoves( self ):
         """
@@ -98,13 +102,14 @@ class EightPuzzleState:
         """
         moves = []
         row, col = self.blankLocation
+        last = self.size - 1
         if(row != 0):
             moves.append('up')
-        if(row != 2):
+        if(row != last):
             moves.append('down')
         if(col != 0):
             moves.append('left')
-        if(col != 2):
+        if(col != last):
             moves.append('right')
         return moves
 
@@ -134,14 +139,16 @@ class EightPuzzleState:
             newrow = row
             newcol = col + 1
         else:
-            raise "Illegal Move"
-
-        # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
-        newPuzzle.cells = [values[:] for values in self.cells]
-        # And update it to reflect the move
-        newPuzzle.cells[row][col] = self.cells[newrow][newcol]
-        newPuzzle.cells[newrow][newcol] = self.cells[row][col]
+            raise Exception("Illegal Move")
+        if not (0 <= newrow < self.size and 0 <= newcol < self.size):
+            raise IndexError("Illegal Move")
+
+        # The tile next to the blank slides into it: copying the puzzle is copying an integer
+        newPuzzle = EightPuzzleState([])
+        newPuzzle.size = self.size
+        shift = 4 * (newrow * self.size + newcol)
+        tile = (self.tiles >> shift) & 15
+        newPuzzle.tiles = self.tiles & ~(15 << shift) | (tile << (4 * (row * self.size + col)))
         newPuzzle.blankLocation = newrow, newcol
 
         return newPuzzle
@@ -156,27 +163,26 @@ class EightPuzzleState:
               EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
           True
         """
-        for row in range( 3 ):
-            if self.cells[row] != other.cells[row]:
-                return False
-        return True
+        return self.tiles == other.tiles and self.size == other.size
 
     def __hash__(self):
-        return hash(str(self.cells))
+        return hash(self.tiles)
 
     def __getAsciiString(self):
         """
           Returns a display string for the maze
         """
         lines = []
-        horizontalLine = ('-' * (13))
+        width = len(str(self.size * self.size - 1))
+        horizontalLine = ('-' * (self.size * (width + 3) + 1))
         lines.append(horizontalLine)
-        for row in self.cells:
+        for row in range(self.size):
             rowLine = '|'
-            for col in row:
-                if col == 0:
-                    col = ' '
-                rowLine = rowLine + ' ' + col.__str__() + ' |'
+            for col in range(self.size):
+                number = self.getCell(row, col)
+                if number == 0:
+                    number = ' '
+                rowLine = rowLine + ' ' + str(number).rjust(width) + ' |'
             lines.append(rowLine)
             lines.append(horizontalLine)
         return '\n'.join(lines)
@@ -184,6 +190,172 @@ class EightPuzzleState:
     def __str__(self):
         return self.__getAsciiString()
 
+def goalTiles(size):
+    "The packed tiles of the solved puzzle: the blank first, then the numbers in order"
+    if size not in _goalTiles:
+        _goalTiles[size] = sum([number << (4 * number) for number in range(size * size)])
+    return _goalTiles[size]
+_goalTiles = {}
+
+def unpackTiles(state):
+    "Returns the number in every cell of the puzzle, in row-major order"
+    tiles = state.tiles
+    return [(tiles >> (4 * i)) & 15 for i in range(state.size * state.size)]
+
+def manhattanHeuristic(state, problem=None):
+    """
+      The sum of the Manhattan distances from every tile to its cell in the
+    goal.  Every move slides one tile one cell, so this is admissible.
+
+    >>> manhattanHeuristic(EightPuzzleState([1, 2, 0, 3, 4, 5, 6, 7, 8]))
+    2
+    """
+    size, distance = state.size, 0
+    for i, number in enumerate(unpackTiles(state)):
+        if number:
+            distance += abs(i // size - number // size) + abs(i % size - number % size)
+    return distance
+
+def linearConflictHeuristic(state, problem=None):
+    """
+      The Manhattan distance plus 2 moves for every tile that has to leave
+    its goal row (or column) to let other tiles of that line pass it: the
+    tiles of a line that are already in it must end up in order, so all but
+    the longest increasing run of them have to step out and back in.  The
+    rows and columns are counted separately, so this stays admissible.
+
+    >>> linearConflictHeuristic(EightPuzzleState([0, 2, 1, 3, 4, 5, 6, 7, 8]))
+    4
+    """
+    size = state.size
+    numbers = unpackTiles(state)
+    conflicts = 0
+    for line in range(size):
+        rowGoals = [number % size for number in numbers[line * size:(line + 1) * size]
+                    if number and number // size == line]
+        columnGoals = [number // size for number in numbers[line::size] if number and number % size == line]
+        conflicts += len(rowGoals) - _longestIncreasing(rowGoals)
+        conflicts += len(columnGoals) - _longestIncreasing(columnGoals)
+    return manhattanHeuristic(state) + 2 * conflicts
+
+def _longestIncreasing(values):
+    longest = [1] * len(values)
+    for i in range(len(values)):
+        for j in range(i):
+            if values[j] < values[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return max(longest + [0])
+
+# The tile groups of the additive pattern databases for each puzzle size
+PATTERN_GROUPS = {3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+                  4: [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)]}
+PATTERN_DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patternDatabases')
+
+def patternDatabaseHeuristic(state, problem=None):
+    """
+      The sum over the tile groups in PATTERN_GROUPS of the moves that the
+    tiles of each group need to reach their goal cells, looked up in a
+    pattern database.  Each database only counts the moves of its own tiles,
+    so their sum is admissible, and it is usually well above the linear
+    conflict heuristic.
+
+    The databases are computed the first time they are needed, which takes
+    a moment for the 8-puzzle and about a minute for the 15-puzzle, and are
+    then stored in PATTERN_DATABASE_DIR.
+    """
+    size = state.size
+    cells = size * size
+    positions = [0] * cells
+    for i, number in enumerate(unpackTiles(state)):
+        positions[number] = i
+    total = 0
+    for group, database in getPatternDatabases(size):
+        index = 0
+        for number in group:
+            index = index * cells + positions[number]
+        total += database[index]
+    return total
+
+_patternDatabases = {}
+
+def getPatternDatabases(size):
+    """
+      Returns a list of (group, database) pairs for the puzzle size, loading
+    or computing the databases as needed.  A database is an array indexed by
+    the cells of the group's tiles, as the digits of a number in base size**2.
+    """
+    if size not in _patternDatabases:
+        databases = []
+        for group in PATTERN_GROUPS[size]:
+            fileName = os.path.join(PATTERN_DATABASE_DIR, 'pdb%d-%s.pkl' % (size, '-'.join(map(str, group))))
+            database = _loadPatternDatabase(fileName)
+            if database is None:
+                database = computePatternDatabase(size, group)
+                _savePatternDatabase(fileName, database)
+            databases.append((group, database))
+        _patternDatabases[size] = databases
+    return _patternDatabases[size]
+
+def computePatternDatabase(size, group):
+    """
+      Computes the database of one tile group with a breadth-first search
+    back from the goal over the cells of the group's tiles and the blank.
+    Sliding one of the group's tiles costs 1 and sliding any other tile
+    costs 0, so it is a 0-1 breadth-first search on a double-ended queue.
+    """
+    cells, k = size * size, len(group)
+    neighbours = []
+    for cell in range(cells):
+        row, col = divmod(cell, size)
+        neighbours.append([r * size + c for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+                           if 0 <= r < size and 0 <= c < size])
+    patternCount = cells ** k
+    # An abstract state is the blank's cell followed by the cells of the group's tiles, as digits in base 'cells'
+    distances = array('B', [255]) * (patternCount * cells)
+    database = array('B', [255]) * patternCount
+    goal = 0
+    for number in group:
+        goal = goal * cells + number
+    distances[goal] = 0
+    fringe = deque([goal])
+    while fringe:
+        abstract = fringe.popleft()
+        distance = distances[abstract]
+        blank, pattern = divmod(abstract, patternCount)
+        if distance < database[pattern]:
+            database[pattern] = distance
+        digits, rest = [], pattern
+        for i in range(k):
+            rest, cell = divmod(rest, cells)
+            digits.append(cell)
+        digits.reverse()
+        for cell in neighbours[blank]:
+            if cell in digits:
+                # A tile of the group slides into the blank
+                place = k - 1 - digits.index(cell)
+                nextPattern = pattern + (blank - cell) * cells ** place
+                cost = 1
+            else:
+                nextPattern, cost = pattern, 0
+            nextAbstract = cell * patternCount + nextPattern
+            if distances[nextAbstract] <= distance + cost: continue
+            distances[nextAbstract] = distance + cost
+            if cost:
+                fringe.append(nextAbstract)
+            else:
+                fringe.appendleft(nextAbstract)
+    return database
+
+def _loadPatternDatabase(fileName):
+    data = util.loadPickle(fileName)
+    if not isinstance(data, str): return None # A corrupt database is simply recomputed
+    database = array('B')
+    database.fromstring(data)
+    return database
+
+def _savePatternDatabase(fileName, database):
+    util.savePickle(fileName, database.tostring())
+
 # TODO: Implement The methods in this class
 
 class EightPuzzleSearchProblem(search.SearchProblem):
@@ -195,9 +367,10 @@ class EightPuzzleSearchProblem(search.SearchProblem):
     def __init__(self,puzzle):
         "Creates a new EightPuzzleSearchProblem which stores search information."
         self.puzzle = puzzle
+        self._expanded = 0
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -208,6 +381,7 @@ class EightPuzzleSearchProblem(search.SearchProblem):
           each succesor is either left, right, up, or down
           from the original state and the cost is 1.0 for each
         """
+        self._expanded += 1
         succ = []
         for a in state.legalMoves():
             succ.append((state.result(a), a, 1))
@@ -249,15 +423,16 @@ def loadEightPuzzle(puzzleNumber):
     """
     return EightPuzzleState(EIGHT_PUZZLE_DATA[puzzleNumber])
 
-def createRandomEightPuzzle(moves=100):
+def createRandomEightPuzzle(moves=100, size=3):
     """
       moves: number of random moves to apply
+      size: the number of rows and columns (4 for the 15-puzzle)
 
       Creates a random eight puzzle by applying
       a series of 'moves' random moves to a solved
       puzzle.
     """
-    puzzle = EightPuzzleState([0,1,2,3,4,5,6,7,8])
+    puzzle = EightPuzzleState(range(size * size))
     for i in range(moves):
         # Execute a random legal move
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
@@ -191,6 +191,7 @@ class Grid:
 
     def __eq__(self, other):
         if other == None: return False
+        if isinstance(other, BitGrid): return other == self
         return self.data == other.data
 
     def __hash__(self):
@@ -275,6 +276,150 @@ class Grid:
                 bools.append(False)
         return bools
 
+class BitGrid(Grid):
+    """
+    A Grid of booleans backed by a single integer bitmask instead of a list of
+    lists.  Cell (x,y) is bit x * height + y, the same column-major order that
+    Grid uses for hashing and packBits, so a BitGrid and a Grid with the same
+    contents are equal and hash alike.
+
+    Data is still accessed via grid[x][y] (reads and writes).  Because the
+    bitmask is an immutable integer, copy() and shallowCopy() are O(1) and
+    both return an independent grid; hashing is O(words), count() is a
+    popcount and asList() only visits the cells it returns.
+    """
+    def __init__(self, width, height, initialValue=False, bitRepresentation=None):
+        if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
+        self.CELLS_PER_INT = 30
+
+        self.width = width
+        self.height = height
+        self.bits = (1 << (width * height)) - 1 if initialValue else 0
+        if bitRepresentation:
+            self._unpackBits(bitRepresentation)
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.width: raise IndexError('BitGrid column out of range')
+        return _BitGridColumn(self, i)
+
+    def __setitem__(self, key, item):
+        column = self[key]
+        for y in range(self.height):
+            column[y] = item[y]
+
+    def __str__(self):
+        out = [[str(self[x][y])[0] for x in range(self.width)] for y in range(self.height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None: return False
+        if self.width != other.width or self.height != other.height: return False
+        if not isinstance(other, BitGrid):
+            other = BitGrid.fromGrid(other)
+        return self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def copy(self):
+        g = BitGrid(self.width, self.height)
+        g.bits = self.bits
+        return g
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        return self.copy()
+
+    def count(self, item =True ):
+        setBits = bin(self.bits).count('1')
+        if item: return setBits
+        return self.width * self.height - setBits
+
+    def asList(self, key = True):
+        bits = self.bits if key else ~self.bits & ((1 << (self.width * self.height)) - 1)
+        list = []
+        while bits:
+            lowest = bits & -bits
+            list.append(self._cellIndexToPosition(lowest.bit_length() - 1))
+            bits ^= lowest
+        return list
+
+    def fromGrid(grid):
+        "Returns a BitGrid with the same contents as any Grid"
+        g = BitGrid(grid.width, grid.height)
+        g.bits = _gridToBits(grid)
+        return g
+    fromGrid = staticmethod(fromGrid)
+
+    def _setBit(self, index, value):
+        if value:
+            self.bits |= 1 << index
+        else:
+            self.bits &= ~(1 << index)
+
+class FrozenBitGrid(BitGrid):
+    """
+    An immutable BitGrid meant to live inside search states.  Its count and
+    hash are computed once, and without(x, y) returns the grid with one cell
+    cleared, so a successor costs a single integer operation instead of a
+    copy.  Writing through grid[x][y] raises; copy() returns a mutable BitGrid.
+    """
+    def __init__(self, width, height, bits=0, setBits=None):
+        self.CELLS_PER_INT = 30
+
+        self.width = width
+        self.height = height
+        self.bits = bits
+        if setBits == None: setBits = bin(bits).count('1')
+        self._count = setBits
+        self._hash = hash(bits)
+
+    def __hash__(self):
+        return self._hash
+
+    def count(self, item =True ):
+        if item: return self._count
+        return self.width * self.height - self._count
+
+    def without(self, x, y):
+        "Returns this grid with (x,y) set to False"
+        bit = 1 << (x * self.height + y)
+        if not self.bits & bit: return self
+        return FrozenBitGrid(self.width, self.height, self.bits ^ bit, self._count - 1)
+
+    def freeze(grid):
+        "Returns a FrozenBitGrid with the same contents as any Grid"
+        if isinstance(grid, FrozenBitGrid): return grid
+        return FrozenBitGrid(grid.width, grid.height, _gridToBits(grid))
+    freeze = staticmethod(freeze)
+
+    def _setBit(self, index, value):
+        raise Exception('FrozenBitGrids cannot be modified; use without() or copy()')
+
+def _gridToBits(grid):
+    if isinstance(grid, BitGrid): return grid.bits
+    bits = 0
+    for x, y in grid.asList():
+        bits |= 1 << (x * grid.height + y)
+    return bits
+
+class _BitGridColumn:
+    "The column grid[x] of a BitGrid, so that grid[x][y] reads and writes its bits"
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.offset = x * grid.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height: raise IndexError('BitGrid row out of range')
+        return (self.grid.bits >> (self.offset + y)) & 1 == 1
+
+    def __setitem__(self, y, value):
+        if not 0 <= y < self.grid.height: raise IndexError('BitGrid row out of range')
+        self.grid._setBit(self.offset + y, value)
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1,2)):
         return bitRep
@@ -14,7 +14,7 @@
 
 
 from util import manhattanDistance
-from game import Grid
+from game import Grid, BitGrid
 import os
 import random
 
@@ -23,13 +23,21 @@ VISIBILITY_MATRIX_CACHE = {}
 class Layout:
     """
     A Layout manages the static information about the game board.
+
+    With useBitGrids the food is stored in a game.BitGrid, which makes the
+    copies and hashes done for every successor state much cheaper.  Walls are
+    only read, so they always stay a plain Grid.
     """
 
-    def __init__(self, layoutText):
+    def __init__(self, layoutText, useBitGrids=False):
         self.width = len(layoutText[0])
         self.height= len(layoutText)
+        self.useBitGrids = useBitGrids
         self.walls = Grid(self.width, self.height, False)
-        self.food = Grid(self.width, self.height, False)
+        if useBitGrids:
+            self.food = BitGrid(self.width, self.height, False)
+        else:
+            self.food = Grid(self.width, self.height, False)
         self.capsules = []
         self.agentPositions = []
         self.numGhosts = 0
@@ -91,7 +99,7 @@ class Layout:
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return Layout(self.layoutText[:])
+        return Layout(self.layoutText[:], self.useBitGrids)
 
     def processLayoutText(self, layoutText):
         """
@@ -129,22 +137,22 @@ class Layout:
         elif layoutChar in  ['1', '2', '3', '4']:
             self.agentPositions.append( (int(layoutChar), (x,y)))
             self.numGhosts += 1
-def getLayout(name, back = 2):
+def getLayout(name, back = 2, useBitGrids = False):
     if name.endswith('.lay'):
-        layout = tryToLoad('layouts/' + name)
-        if layout == None: layout = tryToLoad(name)
+        layout = tryToLoad('layouts/' + name, useBitGrids)
+        if layout == None: layout = tryToLoad(name, useBitGrids)
     else:
-        layout = tryToLoad('layouts/' + name + '.lay')
-        if layout == None: layout = tryToLoad(name + '.lay')
+        layout = tryToLoad('layouts/' + name + '.lay', useBitGrids)
+        if layout == None: layout = tryToLoad(name + '.lay', useBitGrids)
     if layout == None and back >= 0:
         curdir = os.path.abspath('.')
         os.chdir('..')
-        layout = getLayout(name, back -1)
+        layout = getLayout(name, back -1, useBitGrids)
         os.chdir(curdir)
     return layout
 
-def tryToLoad(fullname):
+def tryToLoad(fullname, useBitGrids = False):
     if(not os.path.exists(fullname)): return None
     f = open(fullname)
-    try: return Layout([line.strip() for line in f])
+    try: return Layout([line.strip() for line in f], useBitGrids)
     finally: f.close()
@@ -0,0 +1,139 @@
+# mazeDistances.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for 
+# educational purposes provided that (1) you do not distribute or publish 
+# solutions, (2) you retain this notice, and (3) you provide clear 
+# attribution to UC Berkeley, including a link to 
+# http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+# 
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero 
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and 
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Exact maze distances between the cells of a Pacman layout.
+
+getMazeDistances(walls) returns a MazeDistances table for a walls Grid.  The
+table is built with one breadth-first search from every open cell, after which
+the true maze distance between any two cells is a single array lookup.  Tables
+are cached on disk, keyed by a hash of the layout text of the walls, so each
+maze is only ever computed once.  In memory, only the tables of the last
+MAX_CACHED_TABLES layouts used are kept.
+"""
+
+from array import array
+from collections import OrderedDict
+import hashlib
+import os
+
+import util
+
+UNREACHABLE = 0xFFFF # Stored for pairs of cells with no path between them
+MAX_CACHED_TABLES = 4 # Tables kept in memory; the others are reloaded from disk when used again
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distanceCache')
+
+class MazeDistances:
+    """
+    All-pairs maze distances for the open cells of a walls Grid, stored as
+    unsigned 16-bit integers in one flat array of size cells * cells.  For
+    every cell it also stores the other cells in order of increasing distance,
+    so the closest cell matching some condition is found without a search.
+    """
+    def __init__(self, walls):
+        self.width, self.height = walls.width, walls.height
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.index = dict([(cell, i) for i, cell in enumerate(self.cells)])
+        self.distances, self.order = self._computeDistances()
+
+    def _computeDistances(self):
+        n = len(self.cells)
+        neighbours = []
+        for x, y in self.cells:
+            adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+            neighbours.append([self.index[cell] for cell in adjacent if cell in self.index])
+
+        distances = array('H', [UNREACHABLE]) * (n * n)
+        order = array('H')
+        for source in range(n):
+            row = source * n
+            distances[row + source] = 0
+            reached = [source]
+            frontier, distance = [source], 0
+            while frontier:
+                distance += 1
+                nextFrontier = []
+                for cell in frontier:
+                    for neighbour in neighbours[cell]:
+                        if distances[row + neighbour] == UNREACHABLE:
+                            distances[row + neighbour] = distance
+                            nextFrontier.append(neighbour)
+                frontier = nextFrontier
+                reached.extend(frontier)
+            if len(reached) < n:
+                reachedSet = set(reached)
+                reached.extend([cell for cell in range(n) if cell not in reachedSet])
+            order.extend(reached)
+        return distances, order
+
+    def getDistance(self, pos1, pos2):
+        """
+        Returns the maze distance between two open cells given as integer
+        (x, y) tuples, or UNREACHABLE if there is no path between them.
+        """
+        return self.distances[self.index[pos1] * len(self.cells) + self.index[pos2]]
+
+    def getClosest(self, pos, grid):
+        """
+        Returns (distance, cell) for the reachable cell closest to pos whose
+        value in 'grid' (a Grid such as the food) is True, or None if there is
+        no such cell.  Ties are resolved in breadth-first order.
+        """
+        n = len(self.cells)
+        row = self.index[pos] * n
+        cells, distances = self.cells, self.distances
+        for cell in self.order[row:row + n]:
+            x, y = cells[cell]
+            if grid[x][y]:
+                distance = distances[row + cell]
+                if distance == UNREACHABLE: return None
+                return distance, cells[cell]
+        return None
+
+    def __getstate__(self):
+        return (self.width, self.height, self.cells, self.distances.tostring(), self.order.tostring())
+
+    def __setstate__(self, state):
+        self.width, self.height, self.cells, distances, order = state
+        self.index = dict([(cell, i) for i, cell in enumerate(self.cells)])
+        self.distances, self.order = array('H'), array('H')
+        self.distances.fromstring(distances)
+        self.order.fromstring(order)
+
+_lastGrid = (None, None)  # (walls, table) of the last call, so repeated calls skip hashing the walls
+_tablesByHash = OrderedDict()  # layout hash -> table, least recently used first
+
+def getMazeDistances(walls):
+    """
+    Returns the MazeDistances for a walls Grid, computing it only if it is in
+    neither the memory cache nor the disk cache.
+    """
+    global _lastGrid
+    if _lastGrid[0] is walls:
+        return _lastGrid[1]
+
+    layoutHash = hashlib.sha1(str(walls)).hexdigest()
+    table = _tablesByHash.pop(layoutHash, None)
+    fileName = os.path.join(CACHE_DIR, layoutHash + '.pkl')
+    if table is None:
+        table = util.loadPickle(fileName)
+    if table is None:
+        table = MazeDistances(walls)
+        util.savePickle(fileName, table)
+    _tablesByHash[layoutHash] = table
+    while len(_tablesByHash) > MAX_CACHED_TABLES:
+        _tablesByHash.popitem(last=False)
+    _lastGrid = (walls, table)
+    return table
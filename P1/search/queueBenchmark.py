@@ -0,0 +1,80 @@
+# queueBenchmark.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to
+# http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Micro-benchmark of the FIFO queue behind breadthFirstSearch.
+
+Runs BFS on a layout with util.Queue, which keeps its items in a deque, and
+with the list-based queue it replaced, which inserted every item at the front
+of a list and so copied the whole queue on each push:
+
+  python queueBenchmark.py -l bigMaze -r 20
+
+Both queues expand the same nodes in the same order, so only the time differs.
+"""
+
+import optparse
+import time
+
+import layout
+import pacman
+import search
+import searchAgents
+import util
+
+class ListQueue(util.Queue):
+    "The former util.Queue: push is O(n), pop is O(1)"
+    def __init__(self):
+        self.list = []
+
+    def push(self, item):
+        self.list.insert(0, item)
+
+    def pop(self):
+        return self.list.pop()
+
+def timeBFS(problem, queueClass, repetitions):
+    "Returns the best time of 'repetitions' BFS runs and the path found"
+    best = float('inf')
+    for _ in range(repetitions):
+        startTime = time.time()
+        path = search.graphSearch(problem, queueClass())
+        best = min(best, time.time() - startTime)
+    return best, path
+
+def main():
+    parser = optparse.OptionParser(usage='python queueBenchmark.py [options]')
+    parser.add_option('-l', '--layout', dest='layout', default='bigMaze',
+                      help='the layout to search, with a single dot as the goal [Default: %default]')
+    parser.add_option('-r', '--repetitions', dest='repetitions', type='int', default=10,
+                      help='runs per queue; the best time is reported [Default: %default]')
+    options, _ = parser.parse_args()
+
+    lay = layout.getLayout(options.layout)
+    if lay is None: raise Exception("The layout " + options.layout + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    problem = searchAgents.PositionSearchProblem(gameState, goal=lay.food.asList()[0], warn=False, visualize=False)
+
+    times = {}
+    for name, queueClass in [('list', ListQueue), ('deque', util.Queue)]:
+        problem._expanded = 0
+        times[name], path = timeBFS(problem, queueClass, options.repetitions)
+        print('%-6s %8.2f ms  cost %d, %d nodes expanded per run'
+              % (name, times[name] * 1000, problem.getCostOfActions(path), problem._expanded / options.repetitions))
+    print('speedup: %.2fx' % (times['list'] / times['deque']))
+
+if __name__ == '__main__':
+    main()
@@ -21,6 +21,12 @@ Pacman agents (in searchAgents.py).
 """
 
 import util
+import time
+import copy
+import multiprocessing
+import os
+import Queue
+import signal
 
 class SearchProblem:
     """
@@ -64,6 +70,64 @@ class SearchProblem:
         """
         util.raiseNotDefined()
 
+    # The SearchObservers notified by the search functions (see addObserver)
+    observers = ()
+
+    def addObserver(self, observer):
+        """
+        Registers a SearchObserver, whose hooks the search functions below call
+        while they solve this problem.  Problems without observers pay nothing
+        but an empty loop per node.
+        """
+        self.observers = self.observers + (observer,)
+
+class SearchObserver:
+    """
+    Hooks called by the search functions while they solve a problem that the
+    observer was added to (see SearchProblem.addObserver).  Every hook gets a
+    state and the cost of the path it was reached with; subclasses override
+    the hooks they need.
+    """
+
+    def onPush(self, state, cost):
+        "Called when 'state' is added to the fringe."
+        pass
+
+    def onExpand(self, state, cost):
+        "Called when the successors of 'state' are about to be generated."
+        pass
+
+    def onGoal(self, state, cost):
+        "Called when the search returns (or, for anytime searches, improves) a path to 'state'."
+        pass
+
+class TimingObserver(SearchObserver):
+    """
+    Counts the pushed and expanded states and records, for every goal reached,
+    the seconds since the observer was created and the cost of the path.
+    """
+
+    def __init__(self):
+        self.startTime = time.time()
+        self.pushed, self.expanded, self.goals = 0, 0, []
+
+    def onPush(self, state, cost):
+        self.pushed += 1
+
+    def onExpand(self, state, cost):
+        self.expanded += 1
+
+    def onGoal(self, state, cost):
+        self.goals.append((time.time() - self.startTime, cost))
+
+    def summary(self):
+        seconds = time.time() - self.startTime
+        text = '%d states expanded and %d pushed in %.2f seconds (%.0f expansions per second)' \
+               % (self.expanded, self.pushed, seconds, self.expanded / max(seconds, 1e-6))
+        for seconds, cost in self.goals:
+            text += '\n  path of cost %s after %.2f seconds' % (cost, seconds)
+        return text
+
 
 def tinyMazeSearch(problem):
     """
@@ -75,41 +139,113 @@ def tinyMazeSearch(problem):
     w = Directions.WEST
     return  [s, s, w, s, w, w, s, w]
 
+def graphSearch(problem, fringe):
+    """
+    Generic graph search shared by DFS, BFS and A*; the fringe decides the
+    order in which nodes are expanded.
+
+    Fringe nodes are (state, action, cost, parent) tuples, where 'parent' is the
+    state the node was generated from.  Expanded states are kept in a dictionary
+    that maps each state to the (parent, action) pair it was first expanded
+    with, so membership checks are O(1) and the list of actions is only rebuilt
+    once a goal is popped.
+
+    The largest size the fringe reached is left in problem._maxFringe, and the
+    problem's observers are notified of every push, expansion and goal.
+    """
+    closed, maxFringe = {}, 1
+    observers = getObservers(problem)
+    start = problem.getStartState()
+    fringe.push((start, None, 0, None))
+    for observer in observers: observer.onPush(start, 0)
+    while not fringe.isEmpty():
+        state, action, cost, parent = fringe.pop()
+        if problem.isGoalState(state):
+            problem._maxFringe = maxFringe
+            for observer in observers: observer.onGoal(state, cost)
+            return reconstructPath(closed, parent, action)
+        if state not in closed:
+            closed[state] = (parent, action)
+            for observer in observers: observer.onExpand(state, cost)
+            for n_state, n_action, n_cost in problem.getSuccessors(state):
+                fringe.push((n_state, n_action, cost + n_cost, state))
+                for observer in observers: observer.onPush(n_state, cost + n_cost)
+            maxFringe = max(maxFringe, len(fringe))
+    problem._maxFringe = maxFringe
+
+def indexedGraphSearch(problem, heuristic, tieBreak='fifo'):
+    """
+    Best-first graph search on a util.IndexedPriorityQueue, ordered by cost
+    plus heuristic, with ties broken as in aStarSearch.
+
+    Unlike graphSearch, every state is queued at most once: when a cheaper path
+    to a queued state is found its entry is updated in place (decrease-key)
+    instead of pushing a duplicate, which keeps the fringe no larger than the
+    number of generated states.
+    """
+    priority = priorityFunction(problem, heuristic, tieBreak)
+    start = problem.getStartState()
+    fringe, closed, maxFringe = util.IndexedPriorityQueue(), {}, 1
+    observers = getObservers(problem)
+    queued = {start: (0, None, None)} # queued state -> (cost, parent, action)
+    fringe.push(start, priority(start, 0))
+    for observer in observers: observer.onPush(start, 0)
+    while not fringe.isEmpty():
+        state = fringe.pop()
+        cost, parent, action = queued.pop(state)
+        if problem.isGoalState(state):
+            problem._maxFringe = maxFringe
+            for observer in observers: observer.onGoal(state, cost)
+            return reconstructPath(closed, parent, action)
+        closed[state] = (parent, action)
+        for observer in observers: observer.onExpand(state, cost)
+        for n_state, n_action, n_cost in problem.getSuccessors(state):
+            if n_state in closed:
+                continue
+            n_cost += cost
+            if n_state in queued and queued[n_state][0] <= n_cost:
+                continue
+            queued[n_state] = (n_cost, state, n_action)
+            fringe.update(n_state, priority(n_state, n_cost))
+            for observer in observers: observer.onPush(n_state, n_cost)
+        maxFringe = max(maxFringe, len(fringe))
+    problem._maxFringe = maxFringe
+
+def reconstructPath(closed, parent, action):
+    """
+    Follows the parent pointers stored in 'closed' back to the start state and
+    returns the actions that lead from it to the node (parent, action).
+    """
+    actions = []
+    while action is not None:
+        actions.append(action)
+        parent, action = closed[parent]
+    actions.reverse()
+    return actions
+
+def getObservers(problem):
+    "The SearchObservers of 'problem', which need not extend SearchProblem"
+    return getattr(problem, 'observers', ())
+
 def depthFirstSearch(problem):
     """Search the deepest nodes in the search tree first."""
-    visited, stack = [], util.Stack()
-    # The stack starts with the start node.
-    stack.push((problem.getStartState(), [], 0))
-    while(not stack.isEmpty()):
-        pos, dir, cost = stack.pop()
-        if problem.isGoalState(pos): # If we've reached the end, the directions to follow will be returned.
-            return dir
-        if pos not in visited: # If we haven't visited the node, it's added to the visited list.
-			visited.append(pos)
-            # Also the possible next nodes are added to the stack. Directions and costs are also added to the 
-            # ones that they already have.
-			for n_pos, n_dir, n_cost in problem.getSuccessors(pos):
-				stack.push((n_pos, dir + [n_dir], cost + n_cost))
+    return graphSearch(problem, util.Stack())
 
 def breadthFirstSearch(problem):
     """Search the shallowest nodes in the search tree first."""
     # Same as the DFS algorithm, but instead of using a Stack we'll be using a Queue, so the exploration will
     # start from the shallow nodes before exploring the deepest ones.
-    visited, queue = [], util.Queue()
-    queue.push((problem.getStartState(), [], 0))
-    while(not queue.isEmpty()):
-        pos, dir, cost = queue.pop()
-        if problem.isGoalState(pos):
-            return dir
-        if pos not in visited:
-			visited.append(pos)
-			for n_pos, n_dir, n_cost in problem.getSuccessors(pos):
-				queue.push((n_pos, dir + [n_dir], cost + n_cost))
-
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
-    "*** YOUR CODE HERE ***"
-    util.raiseNotDefined()
+    return graphSearch(problem, util.Queue())
+
+def uniformCostSearch(problem, decreaseKey=False, tieBreak='fifo'):
+    """
+    Search the node of least total cost first.
+
+    This is A* without a heuristic, so it shares its closed set and fringe
+    machinery, including the decreaseKey and tieBreak options.  Step costs can
+    be any non-negative numbers, e.g. the .5 ** x costs of StayEastSearchAgent.
+    """
+    return aStarSearch(problem, nullHeuristic, decreaseKey, tieBreak)
 
 def nullHeuristic(state, problem=None):
     """
@@ -118,27 +254,466 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    visited, queue = [], util.PriorityQueue()
-    #entry = (priority, self.count, item)
-    # The A* algorithm is based on the previous implementations of the BFS and DFS algorithms.
+def aStarSearch(problem, heuristic=nullHeuristic, decreaseKey=False, tieBreak='fifo'):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    With decreaseKey, the fringe keeps one entry per state and lowers its
+    priority when a cheaper path is found (see indexedGraphSearch).
+
+    tieBreak chooses which of the nodes with the same cost plus heuristic is
+    expanded first:
+      fifo   the one pushed first (the default)
+      lifo   the one pushed last
+      highg  the one with the highest cost so far, i.e. the deepest one
+      lowh   the one with the lowest heuristic; among nodes of equal cost
+             plus heuristic this is the same node as highg
+    Any policy finds an optimal path, but the number of nodes expanded before
+    the goal is popped can differ a lot (see benchmark.py --tieBreaks).
+    """
     # A* uses a priority queue, so that the node with the best heuristic and the least cost is preferred. The
-    # heuristic function is passed by parameter.
-    queue.push((problem.getStartState(), [], 0), 0)
-    while(not queue.isEmpty()):
-        pos, dir, cost = queue.pop()
-        if problem.isGoalState(pos):
-            return dir
-        if pos not in visited:
-			visited.append(pos)
-			for n_pos, n_dir, n_cost in problem.getSuccessors(pos):
-            # Path of how to get to the node is added and pushed to the priority queue. The priority is based on the
-            # acumulated cost, the new action cost and the heuristic.
-				queue.push((n_pos, dir + [n_dir], cost + n_cost), (cost + n_cost + heuristic(n_pos, problem)))
+    # priority of a node is its acumulated cost plus the heuristic of its state.
+    if decreaseKey:
+        return indexedGraphSearch(problem, heuristic, tieBreak)
+    priority = priorityFunction(problem, heuristic, tieBreak)
+    return graphSearch(problem, util.PriorityQueueWithFunction(lambda node: priority(node[0], node[2])))
+
+def priorityFunction(problem, heuristic, tieBreak='fifo'):
+    """
+    Returns a function from a (state, cost) pair to its priority in A*: the
+    cost plus the heuristic, followed by a tie-breaking key for the tieBreak
+    policies other than fifo (see aStarSearch).  Insertion order breaks any
+    remaining ties in the priority queues.
+    """
+    if tieBreak == 'fifo':
+        return lambda state, cost: cost + heuristic(state, problem)
+    if tieBreak == 'highg':
+        return lambda state, cost: (cost + heuristic(state, problem), -cost)
+    if tieBreak == 'lowh':
+        def lowhPriority(state, cost):
+            h = heuristic(state, problem)
+            return (cost + h, h)
+        return lowhPriority
+    if tieBreak == 'lifo':
+        pushes = [0]
+        def lifoPriority(state, cost):
+            pushes[0] -= 1
+            return (cost + heuristic(state, problem), pushes[0])
+        return lifoPriority
+    raise AttributeError, tieBreak + ' is not a tieBreak policy; use fifo, lifo, highg or lowh.'
+
+def anytimeWeightedAStar(problem, heuristic=nullHeuristic, weight=3.0, timeLimit=None):
+    """
+    Anytime weighted A*: a weighted A* search, ordered by cost plus 'weight'
+    times the heuristic, finds a first solution quickly, and is then repeated
+    with smaller and smaller weights for as long as 'timeLimit' seconds allow.
+    Each weight halves the distance of the previous one to 1, and the last
+    search uses weight 1, which is plain A*.  Every search prunes the nodes
+    whose cost plus heuristic cannot beat the best solution found so far.
+
+    With an admissible and consistent heuristic, a solution found with weight
+    w costs at most w times the optimal cost.  Every improvement is printed
+    with that bound, and the list of (seconds, cost, bound) improvements is
+    left in problem._anytimeSolutions.  Nodes of equal priority are expanded
+    deepest first, so that the first search dives towards a goal.  The first
+    search always runs to the end, whatever the deadline, so a solution is
+    returned whenever one exists.  After it, returns the best solution found
+    before the deadline, which is optimal if the weight 1 search completed.
+    """
+    deadline = None if timeLimit is None else time.time() + float(timeLimit)
+    startTime = time.time()
+    best, bestCost = None, float('inf')
+    problem._anytimeSolutions, maxFringe = [], 1
+    observers = getObservers(problem)
+    weight = float(weight)
+    while True:
+        start = problem.getStartState()
+        fringe, closed = util.PriorityQueue(), {}
+        h = heuristic(start, problem)
+        fringe.push((start, None, 0, h, None), (weight * h, 0))
+        for observer in observers: observer.onPush(start, 0)
+        while not fringe.isEmpty():
+            if best is not None and deadline is not None and time.time() > deadline:
+                problem._maxFringe = maxFringe
+                return best
+            state, action, cost, h, parent = fringe.pop()
+            if state in closed or cost + h >= bestCost:
+                continue
+            closed[state] = (parent, action)
+            if problem.isGoalState(state):
+                best, bestCost = reconstructPath(closed, parent, action), cost
+                problem._anytimeSolutions.append((time.time() - startTime, cost, weight))
+                print('[AnytimeAStar] found a path of cost %s with weight %.2f (at most %.2f times optimal) after %.2f seconds'
+                      % (cost, weight, weight, time.time() - startTime))
+                for observer in observers: observer.onGoal(state, cost)
+                break
+            for observer in observers: observer.onExpand(state, cost)
+            for n_state, n_action, n_cost in problem.getSuccessors(state):
+                if n_state not in closed:
+                    n_cost += cost
+                    n_h = heuristic(n_state, problem)
+                    fringe.push((n_state, n_action, n_cost, n_h, state), (n_cost + weight * n_h, -n_cost))
+                    for observer in observers: observer.onPush(n_state, n_cost)
+            maxFringe = max(maxFringe, len(fringe))
+        if weight == 1.0:
+            # Nothing cheaper than 'best' is left to find
+            if best is not None:
+                print('[AnytimeAStar] the path of cost %s is optimal (%.2f seconds)' % (bestCost, time.time() - startTime))
+            problem._maxFringe = maxFringe
+            return best
+        weight = 1.0 + (weight - 1.0) / 2
+        if weight < 1.05: weight = 1.0
+
+def iterativeDeepeningAStar(problem, heuristic=nullHeuristic, tableSize=0):
+    """
+    Iterative-deepening A* (IDA*): repeated depth-first searches that prune
+    every node whose cost plus heuristic exceeds a bound, raising the bound to
+    the smallest pruned value after each iteration.  Only the current path is
+    kept in memory, so memory grows with the solution depth rather than with
+    the size of the fringe (problem._maxFringe is the deepest path held).  The
+    heuristic must be admissible.
+
+    With tableSize > 0, a transposition table of up to tableSize states
+    remembers the cheapest cost each state was reached with during the current
+    iteration, and prunes paths that reach it again at no lower cost.  Once the
+    table is full, new states are no longer added to it.
+    """
+    start = problem.getStartState()
+    bound = heuristic(start, problem)
+    maxFringe = 1
+    observers = getObservers(problem)
+    while True:
+        nextBound = float('inf')
+        table = {start: 0}
+        # The current path: states, their costs, the actions between them and
+        # an iterator over the successors still to be tried from each state
+        states, costs, actions, successors = [start], [0], [], [None]
+        onPath = set([start])
+        while states:
+            state, cost = states[-1], costs[-1]
+            if successors[-1] is None:
+                f = cost + heuristic(state, problem)
+                if f > bound:
+                    nextBound = min(nextBound, f)
+                    successors[-1] = iter([])
+                elif problem.isGoalState(state):
+                    problem._maxFringe = max(maxFringe, len(states))
+                    for observer in observers: observer.onGoal(state, cost)
+                    return actions
+                else:
+                    for observer in observers: observer.onExpand(state, cost)
+                    successors[-1] = iter(problem.getSuccessors(state))
+            for n_state, n_action, n_cost in successors[-1]:
+                if n_state in onPath:
+                    continue
+                n_cost += cost
+                if tableSize:
+                    if table.get(n_state, float('inf')) <= n_cost:
+                        continue
+                    if n_state in table or len(table) < tableSize:
+                        table[n_state] = n_cost
+                states.append(n_state)
+                costs.append(n_cost)
+                actions.append(n_action)
+                successors.append(None)
+                onPath.add(n_state)
+                for observer in observers: observer.onPush(n_state, n_cost)
+                break
+            else:
+                # Every successor has been tried: backtrack
+                maxFringe = max(maxFringe, len(states))
+                onPath.discard(states.pop())
+                costs.pop()
+                successors.pop()
+                if actions: actions.pop()
+        if nextBound == float('inf'):
+            problem._maxFringe = maxFringe
+            return None
+        bound = nextBound
+
+def bidirectionalSearch(problem, heuristic=nullHeuristic):
+    """
+    Search forwards from the start state and backwards from the goal at the
+    same time, always expanding the side with the smaller fringe, until the
+    two searches have provably found the cheapest path through a state they
+    share.  With the null heuristic this is bidirectional uniform cost search
+    (bidirectional BFS on unit costs); otherwise it is front-to-end
+    bidirectional A*, which needs a consistent heuristic.
+
+    The problem must name its single goal state in problem.goal and provide
+    getPredecessors(state), returning (predecessor, action, stepCost) triples
+    where 'action' leads from the predecessor to 'state' (see
+    PositionSearchProblem).  The backward search calls the heuristic on a copy
+    of the problem whose goal is the start state, so heuristics that measure
+    the distance to problem.goal work in both directions.
+    """
+    start, goal = problem.getStartState(), problem.goal
+    if start == goal:
+        return []
+    backwardProblem = copy.copy(problem)
+    backwardProblem.goal = start
+
+    # Per-direction data, indexed by 0 (forwards) and 1 (backwards)
+    fringes = [util.PriorityQueue(), util.PriorityQueue()]
+    costs = [{start: 0}, {goal: 0}]
+    parents = [{start: (None, None)}, {goal: (None, None)}]
+    closed = [set(), set()]
+    expand = [problem.getSuccessors, problem.getPredecessors]
+    views = [problem, backwardProblem]
+    fringes[0].push(start, heuristic(start, problem))
+    fringes[1].push(goal, heuristic(goal, backwardProblem))
+    observers = getObservers(problem)
+    for observer in observers:
+        observer.onPush(start, 0)
+        observer.onPush(goal, 0)
+
+    best, meeting = float('inf'), None
+    maxFringe = 2
+    while not fringes[0].isEmpty() and not fringes[1].isEmpty():
+        # Stop once neither fringe can lead to a path cheaper than 'best'
+        topForward, topBackward = fringes[0].peekPriority(), fringes[1].peekPriority()
+        if heuristic is nullHeuristic:
+            if topForward + topBackward >= best: break
+        elif max(topForward, topBackward) >= best:
+            break
+
+        side = 0 if len(fringes[0]) <= len(fringes[1]) else 1
+        state = fringes[side].pop()
+        if state in closed[side]:
+            continue
+        closed[side].add(state)
+        for observer in observers: observer.onExpand(state, costs[side][state])
+        for n_state, n_action, n_cost in expand[side](state):
+            n_cost += costs[side][state]
+            if n_cost >= costs[side].get(n_state, float('inf')):
+                continue
+            costs[side][n_state] = n_cost
+            parents[side][n_state] = (state, n_action)
+            fringes[side].push(n_state, n_cost + heuristic(n_state, views[side]))
+            for observer in observers: observer.onPush(n_state, n_cost)
+            if n_state in costs[1 - side] and n_cost + costs[1 - side][n_state] < best:
+                best, meeting = n_cost + costs[1 - side][n_state], n_state
+        maxFringe = max(maxFringe, len(fringes[0]) + len(fringes[1]))
+    problem._maxFringe = maxFringe
+
+    if meeting is None:
+        return None
+    for observer in observers: observer.onGoal(goal, best)
+    # Forward half: walk back to the start.  Backward half: walk on to the goal.
+    actions, state = [], meeting
+    while parents[0][state][0] is not None:
+        state, action = parents[0][state]
+        actions.append(action)
+    actions.reverse()
+    state = meeting
+    while parents[1][state][0] is not None:
+        state, action = parents[1][state]
+        actions.append(action)
+    return actions
+
+def jumpPointSearch(problem, heuristic=nullHeuristic):
+    """
+    Jump Point Search: A* on a 4-connected grid with unit step costs that only
+    expands 'jump points' instead of every cell.  Of all the equally short
+    paths it only follows those that move vertically first and turn
+    horizontally whenever they like, but only turn back to vertical where a
+    wall forces them to.  From a node it scans straight ahead until a goal, a
+    wall or such a forced turn is found; vertical scans also scan sideways at
+    every cell.  The scanned cells are never queued, which saves most of the
+    expansions on open layouts, and the path is still optimal.
+
+    The problem must be a position problem on problem.walls whose states are
+    (x,y) cells and whose every move costs 1 (e.g. PositionSearchProblem or
+    AnyFoodSearchProblem); goals are recognized with problem.isGoalState.
+    problem._expanded counts the expanded jump points.
+    """
+    from game import Actions
+    walls = problem.walls
+    width, height = walls.width, walls.height
+
+    def isOpen(x, y):
+        return 0 <= x < width and 0 <= y < height and not walls[x][y]
+
+    def jumpHorizontally(x, y, dx):
+        while True:
+            x += dx
+            if not isOpen(x, y): return None
+            if problem.isGoalState((x, y)): return x, y
+            # A forced neighbour: the cell above or below can only be reached through this one
+            if isOpen(x, y + 1) and not isOpen(x - dx, y + 1): return x, y
+            if isOpen(x, y - 1) and not isOpen(x - dx, y - 1): return x, y
+
+    def jumpVertically(x, y, dy):
+        while True:
+            y += dy
+            if not isOpen(x, y): return None
+            if problem.isGoalState((x, y)): return x, y
+            if jumpHorizontally(x, y, 1) or jumpHorizontally(x, y, -1): return x, y
+
+    def directions(x, y, vector):
+        "The directions worth scanning from (x,y) when it was reached moving along 'vector'"
+        if vector is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx, dy = vector
+        if dy:
+            return [(0, dy), (1, 0), (-1, 0)]
+        forced = [(0, d) for d in [1, -1] if isOpen(x, y + d) and not isOpen(x - dx, y + d)]
+        return forced + [(dx, 0)]
+
+    start = problem.getStartState()
+    fringe, closed, maxFringe = util.PriorityQueue(), {}, 1
+    observers = getObservers(problem)
+    fringe.push((start, None, 0, None), heuristic(start, problem))
+    for observer in observers: observer.onPush(start, 0)
+    while not fringe.isEmpty():
+        state, vector, cost, parent = fringe.pop()
+        if state in closed:
+            continue
+        closed[state] = parent
+        if problem.isGoalState(state):
+            for observer in observers: observer.onGoal(state, cost)
+            break
+        problem._expanded += 1
+        for observer in observers: observer.onExpand(state, cost)
+        x, y = state
+        for dx, dy in directions(x, y, vector):
+            if dy:
+                jumpPoint = jumpVertically(x, y, dy)
+            else:
+                jumpPoint = jumpHorizontally(x, y, dx)
+            if jumpPoint is None or jumpPoint in closed:
+                continue
+            n_cost = cost + abs(jumpPoint[0] - x) + abs(jumpPoint[1] - y)
+            fringe.push((jumpPoint, (dx, dy), n_cost, state), n_cost + heuristic(jumpPoint, problem))
+            for observer in observers: observer.onPush(jumpPoint, n_cost)
+        maxFringe = max(maxFringe, len(fringe))
+    else:
+        problem._maxFringe = maxFringe
+        return None
+    problem._maxFringe = maxFringe
+
+    # Fill in every step of the straight segments between the jump points
+    actions = []
+    while closed[state] is not None:
+        parent = closed[state]
+        dx, dy = state[0] - parent[0], state[1] - parent[1]
+        steps = abs(dx) + abs(dy)
+        actions.extend([Actions.vectorToDirection((dx / steps, dy / steps))] * steps)
+        state = parent
+    actions.reverse()
+    return actions
+
+class ExpansionCounter(SearchObserver):
+    "Counts the expansions of a search in counts[index], e.g. a shared array"
+
+    def __init__(self, counts, index):
+        self.counts, self.index = counts, index
+
+    def onExpand(self, state, cost):
+        self.counts[self.index] += 1
+
+def portfolioSearch(problem, strategies):
+    """
+    Races several search strategies on 'problem', each in its own process,
+    and returns the first path found, terminating the other processes.
+    'strategies' is a list of (name, function) pairs where every function
+    takes the problem (see searchAgents.getSearchFunction).  A strategy that
+    finds no path or raises an exception does not end the race.
+
+    The path returned is the first one found, not the best: it is only
+    optimal if every strategy is, e.g. A* with admissible heuristics,
+    bidirectional search or jps.  With a suboptimal strategy in the race
+    (dfs, greedy search, weighted A*), a faster but costlier path wins.
+
+    The processes are forked, so each one inherits a copy of the problem
+    instead of receiving a pickled one: problems hold lambdas and game states,
+    which cannot be pickled.  Inside the processes the problem's observers are
+    replaced by expansion counters, so displays are not drawn from them.  The
+    outcome, time and expansions of every strategy are printed, and
+    problem._expanded is set to those of the winner.  A strategy that returned
+    after the race was decided is reported as 'finished (result unused)', one
+    that was terminated first as 'cancelled'.  Without fork (e.g. on Windows),
+    the strategies run one after the other in this process until one finds a
+    path.
+    """
+    if not hasattr(os, 'fork'):
+        for name, function in strategies:
+            actions = function(problem)
+            if actions is not None:
+                print('[Portfolio] %s found a path first; it is optimal only if every strategy is optimal' % name)
+                return actions
+        return None
+
+    results = multiprocessing.Queue()
+    counts = multiprocessing.RawArray('l', len(strategies))
+    # Seconds each strategy took, set as soon as it returns: its result may never be read from the queue
+    durations = multiprocessing.RawArray('d', len(strategies))
+
+    def run(index, function):
+        problem.observers = (ExpansionCounter(counts, index),)
+        startTime = time.time()
+        try:
+            actions = function(problem)
+        except Exception, e:
+            durations[index] = time.time() - startTime
+            results.put((index, None, durations[index], 'failed: %s' % e))
+        else:
+            durations[index] = time.time() - startTime
+            results.put((index, actions, durations[index], None))
+
+    startTime = time.time()
+    processes = [multiprocessing.Process(target=run, args=(index, function))
+                 for index, (name, function) in enumerate(strategies)]
+    outcomes, winner = {}, None # strategy index -> (actions, seconds, error)
+    try:
+        for process in processes:
+            process.daemon = True
+            process.start()
+        while winner is None and len(outcomes) < len(strategies):
+            try:
+                index, actions, seconds, error = results.get(timeout=0.1)
+            except Queue.Empty:
+                # A process that died without reporting (e.g. out of memory) is out of the race
+                if not [process for index, process in enumerate(processes) if process.is_alive() and index not in outcomes] \
+                        and results.empty():
+                    break
+                continue
+            outcomes[index] = (actions, seconds, error)
+            if actions is not None: winner = index
+    finally:
+        for process in processes:
+            if process.is_alive(): process.terminate()
+            process.join()
+
+    for index, (name, function) in enumerate(strategies):
+        actions, seconds, error = outcomes.get(index, (None, time.time() - startTime, None))
+        if index == winner:
+            outcome = 'found a path of cost %s' % problem.getCostOfActions(actions)
+        elif error:
+            outcome = error
+        elif index in outcomes:
+            outcome = 'found no path'
+        elif durations[index] or processes[index].exitcode == 0:
+            # It returned after the race was decided, or was terminated while reporting
+            outcome, seconds = 'finished (result unused)', durations[index]
+        elif processes[index].exitcode == -signal.SIGTERM:
+            outcome = 'cancelled'
+        else:
+            outcome = 'crashed'
+        print('[Portfolio] %-30s %-26s %8.2f seconds %9d nodes expanded' % (name, outcome, seconds, counts[index]))
+    if winner is None:
+        return None
+    print('[Portfolio] returning the first path found, by %s; it is optimal only if every strategy is optimal'
+          % strategies[winner][0])
+    problem._expanded = counts[winner]
+    return outcomes[winner][0]
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+idastar = iterativeDeepeningAStar
+bidir = bidirectionalSearch
+jps = jumpPointSearch
+awastar = anytimeWeightedAStar
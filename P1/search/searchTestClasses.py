@@ -13,9 +13,11 @@
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
 
+import random
 import re
 import testClasses
 import textwrap
+import util
 
 # import project specific code
 import layout
@@ -820,3 +822,197 @@ class CornerHeuristicPacman(testClasses.TestCase):
         handle.close()
         return True
 
+
+
+def parseSearchArgs(text, searchAgents):
+    "Converts 'key=value,key=value' to a dictionary of keyword arguments, like pacman.py -a"
+    options = {}
+    for option in text.split(','):
+        if option.strip():
+            key, value = option.split('=')
+            options[key.strip()] = searchAgents.parseSearchArg(value.strip())
+    return options
+
+class OptimalSearchTest(testClasses.TestCase):
+    """
+    Checks that a search algorithm, with the options in searchArgs, finds a
+    path as cheap as the reference algorithm (uniformCostSearch by default)
+    and as the cost in the solution file.  With samePath, the path must also
+    be the one the reference returns, for options that should only change
+    how the search runs, not what it finds.
+
+    The layout is given inline or, without 'layout', read from the layouts
+    directory.  PositionSearchProblems lead to the only dot of the layout, or
+    to (1,1) if it has several.
+    """
+
+    def __init__(self, question, testDict):
+        super(OptimalSearchTest, self).__init__(question, testDict)
+        self.layoutName = testDict['layoutName']
+        self.layoutText = testDict.get('layout', None)
+        self.alg = testDict['algorithm']
+        self.searchArgs = testDict.get('searchArgs', '')
+        self.heuristicName = testDict.get('heuristic', None)
+        self.reference = testDict.get('reference', 'uniformCostSearch')
+        self.costFn = eval(testDict.get('costFn', 'None'))
+        self.searchProblemClassName = testDict.get('searchProblemClass', 'PositionSearchProblem')
+        self.samePath = testDict.get('samePath', 'False') == 'True'
+
+    def getProblem(self, searchAgents):
+        if self.layoutText is None:
+            lay = layout.getLayout(self.layoutName)
+        else:
+            lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        gameState = pacman.GameState()
+        gameState.initialize(lay, 0)
+        if self.searchProblemClassName != 'PositionSearchProblem':
+            return getattr(searchAgents, self.searchProblemClassName)(gameState)
+        food = lay.food.asList()
+        options = {'goal': food[0] if len(food) == 1 else (1, 1), 'warn': False, 'visualize': False}
+        if self.costFn != None:
+            options['costFn'] = self.costFn
+        return searchAgents.PositionSearchProblem(gameState, **options)
+
+    def getSolInfo(self, search, searchAgents, alg, options):
+        "Returns (path, cost, error) for one run of the search function named 'alg'"
+        problem = self.getProblem(searchAgents)
+        path = getattr(search, alg)(problem, **options)
+        if type(path) != type([]):
+            return None, None, 'The result of %s must be a list. (Instead, it is %s)' % (alg, type(path))
+        states = followPath(path, problem)
+        if None in states:
+            return None, None, '%s returned an illegal move' % alg
+        if not problem.isGoalState(states[-1]):
+            return None, None, 'The path of %s does not reach the goal' % alg
+        return path, problem.getCostOfActions(path), None
+
+    def getHeuristicOptions(self, search, searchAgents, alg):
+        "The heuristic to pass to the search function named 'alg', if it takes one"
+        if self.heuristicName == None or 'heuristic' not in getattr(search, alg).func_code.co_varnames:
+            return {}
+        return {'heuristic': getattr(searchAgents, self.heuristicName, None) or getattr(search, self.heuristicName)}
+
+    def solveReference(self, search, searchAgents):
+        options = self.getHeuristicOptions(search, searchAgents, self.reference)
+        return self.getSolInfo(search, searchAgents, self.reference, options)
+
+    def solve(self, search, searchAgents):
+        options = parseSearchArgs(self.searchArgs, searchAgents)
+        options.update(self.getHeuristicOptions(search, searchAgents, self.alg))
+        return self.getSolInfo(search, searchAgents, self.alg, options)
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold_cost = float(solutionDict['cost'])
+        description = '%s(%s)' % (self.alg, ', '.join([s for s in [self.heuristicName, self.searchArgs] if s]))
+
+        refPath, refCost, error = self.solveReference(search, searchAgents)
+        if error == None:
+            path, cost, error = self.solve(search, searchAgents)
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\t%s' % error)
+            return False
+
+        for name, found in [(self.reference, refCost), (description, cost)]:
+            if abs(found - gold_cost) > 1e-6 * max(1, gold_cost):
+                grades.addMessage('FAIL: %s' % self.path)
+                grades.addMessage('\t%s found a path of cost %s; the optimal cost is %s' % (name, found, gold_cost))
+                return False
+
+        if self.samePath and path != refPath:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\t%s found another path than %s' % (description, self.reference))
+            grades.addMessage('\tpath:\n%s' % wrap_solution(path))
+            grades.addMessage('\t%s path:\n%s' % (self.reference, wrap_solution(refPath)))
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\t%s path cost:\t%s' % (description, cost))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        path, cost, error = self.solveReference(search, searchAgents)
+        if error != None: raise Exception("Error in solution code: %s" % error)
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The cost of the path found by %s.\n' % self.reference)
+        handle.write('cost: "%r"\n' % cost)
+        handle.close()
+        return True
+
+class IndexedPriorityQueueTest(testClasses.TestCase):
+    """
+    Runs a random sequence of push, update and pop operations on
+    util.IndexedPriorityQueue.  After every operation the heap must be in
+    order and its index must point at every entry, and every pop must return
+    the item a plain sorted list of (priority, insertion count) returns.
+    """
+
+    def __init__(self, question, testDict):
+        super(IndexedPriorityQueueTest, self).__init__(question, testDict)
+        self.seed = int(testDict['seed'])
+        self.operations = int(testDict['operations'])
+        self.items = int(testDict['items'])
+        self.priorities = int(testDict['priorities'])
+
+    def checkHeap(self, queue):
+        "Returns an error message if the heap or its index is broken, else None"
+        if len(queue.index) != len(queue.heap):
+            return 'the index holds %d items but the heap %d' % (len(queue.index), len(queue.heap))
+        for position, entry in enumerate(queue.heap):
+            if queue.index.get(entry[2]) != position:
+                return 'the index of %r is %r instead of %d' % (entry[2], queue.index.get(entry[2]), position)
+            if position > 0 and queue.heap[(position - 1) >> 1][:2] > entry[:2]:
+                return 'the entry at %d comes before its parent' % position
+        return None
+
+    def run(self):
+        "Returns (operations run, error) for the random sequence of operations"
+        rand = random.Random(self.seed)
+        queue, expected, count = util.IndexedPriorityQueue(), {}, 0 # expected: item -> (priority, count)
+        for operation in range(self.operations):
+            choice = rand.random()
+            if choice < 0.3 and expected:
+                item = queue.pop()
+                best = min(expected, key=lambda i: expected[i])
+                if item != best:
+                    return operation, 'pop returned %r instead of %r' % (item, best)
+                del expected[item]
+            else:
+                item, priority = rand.randrange(self.items), rand.randrange(self.priorities)
+                if choice < 0.6:
+                    queue.push(item, priority)
+                    expected[item] = (priority, count)
+                else:
+                    queue.update(item, priority)
+                    if item not in expected or priority < expected[item][0]:
+                        expected[item] = (priority, count)
+                count += 1
+            error = self.checkHeap(queue)
+            if error == None and len(queue) != len(expected):
+                error = 'the queue holds %d items instead of %d' % (len(queue), len(expected))
+            if error != None:
+                return operation, error
+        return self.operations, None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        operations, error = self.run()
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tafter %d operations, %s' % (operations + 1, error))
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\t%d random push, update and pop operations' % operations)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# File intentionally blank.\n')
+        handle.close()
+        return True
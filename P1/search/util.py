@@ -16,7 +16,10 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque
 import cStringIO
+import cPickle
+import os
 
 
 class FixedRandom:
@@ -135,26 +138,37 @@ class Stack:
         "Returns true if the stack is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class Queue:
-    "A container with a first-in-first-out (FIFO) queuing policy."
+    """
+    A container with a first-in-first-out (FIFO) queuing policy.
+
+    Items are kept in a deque, so pushing and popping take constant time
+    (inserting at the front of a list would copy the whole queue on every push).
+    """
     def __init__(self):
-        self.list = []
+        self.list = deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
@@ -183,9 +197,103 @@ class PriorityQueue:
         #  (_, item) = heapq.heappop(self.heap)
         return item
 
+    def peekPriority(self):
+        "Returns the priority of the item pop would return, without removing it"
+        return self.heap[0][0]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def __len__(self):
+        return len(self.heap)
+
+class IndexedPriorityQueue:
+    """
+      A binary heap priority queue that holds each item at most once and
+      keeps an index from items to their position in the heap, so the
+      priority of a queued item can be lowered in O(log n) with update().
+      Items must be hashable.  Like PriorityQueue, ties between equal
+      priorities are broken by insertion order.
+    """
+    def  __init__(self):
+        self.heap = []      # [priority, count, item] entries
+        self.index = {}     # item -> position of its entry in self.heap
+        self.count = 0
+
+    def push(self, item, priority):
+        "Adds 'item' with the given priority, or reprioritizes it if already queued"
+        if item in self.index:
+            entry = self.heap[self.index[item]]
+            entry[0], entry[1] = priority, self.count
+            self.count += 1
+            self._siftUp(self.index[item])
+            self._siftDown(self.index[item])
+            return
+        self.heap.append([priority, self.count, item])
+        self.index[item] = len(self.heap) - 1
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def update(self, item, priority):
+        """
+        If 'item' is queued with a higher priority, lowers it to 'priority'.
+        If it is queued with an equal or lower priority, does nothing.
+        If it is not queued, does the same thing as self.push.
+        """
+        if item in self.index:
+            if self.heap[self.index[item]][0] <= priority: return
+        self.push(item, priority)
+
+    def pop(self):
+        last = self.heap.pop()
+        if self.heap:
+            entry, self.heap[0] = self.heap[0], last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        else:
+            entry = last
+        del self.index[entry[2]]
+        return entry[2]
+
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __contains__(self, item):
+        return item in self.index
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _siftUp(self, pos):
+        heap, index = self.heap, self.index
+        entry = heap[pos]
+        while pos > 0:
+            parentPos = (pos - 1) >> 1
+            parent = heap[parentPos]
+            if entry[:2] >= parent[:2]: break
+            heap[pos] = parent
+            index[parent[2]] = pos
+            pos = parentPos
+        heap[pos] = entry
+        index[entry[2]] = pos
+
+    def _siftDown(self, pos):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[pos]
+        while True:
+            childPos = 2 * pos + 1
+            if childPos >= size: break
+            if childPos + 1 < size and heap[childPos + 1][:2] < heap[childPos][:2]:
+                childPos += 1
+            child = heap[childPos]
+            if entry[:2] <= child[:2]: break
+            heap[pos] = child
+            index[child[2]] = pos
+            pos = childPos
+        heap[pos] = entry
+        index[entry[2]] = pos
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
@@ -578,6 +686,36 @@ def pause():
     print "<Press enter/return to continue>"
     raw_input()
 
+def loadPickle(fileName):
+    """
+    Returns the object pickled in fileName, or None if the file is missing
+    or cannot be unpickled.  Goes with savePickle for caches on disk.
+    """
+    try:
+        f = open(fileName, 'rb')
+    except IOError:
+        return None
+    try: return cPickle.load(f)
+    except Exception: return None # A corrupt or outdated cache file is simply rebuilt
+    finally: f.close()
+
+def savePickle(fileName, obj):
+    """
+    Pickles obj to fileName, creating its directory if needed.  The file is
+    written under a temporary name and renamed, so concurrent readers never
+    see a partial file.  Failures are ignored: a cache is an optimization only.
+    """
+    try:
+        directory = os.path.dirname(fileName)
+        if directory and not os.path.isdir(directory): os.makedirs(directory)
+        tmpName = '%s.%d.tmp' % (fileName, os.getpid())
+        f = open(tmpName, 'wb')
+        try: cPickle.dump(obj, f, cPickle.HIGHEST_PROTOCOL)
+        finally: f.close()
+        os.rename(tmpName, fileName)
+    except (IOError, OSError):
+        pass
+
 
 # code to handle timeouts
 #
@@ -15,7 +15,7 @@
 
 from util import manhattanDistance
 from game import Directions
-import random, util
+import random, util, time
 
 from game import Agent
 
@@ -98,6 +98,119 @@ def scoreEvaluationFunction(currentGameState):
     """
     return currentGameState.getScore()
 
+class TranspositionTable:
+    """
+      A fixed-size table of the results of the adversarial searches, so that a
+      game state reached again through another order of moves is not searched
+      again.
+
+      States are identified by Zobrist hashing: every feature of a state (the
+      position, direction and scared timer of each agent, each food dot and
+      capsule, and whose turn it is) has a random 64-bit key, and the hash of
+      a state is the XOR of the keys of its features.  The key of the food is
+      computed once per list of food columns, which successors share until a
+      dot is eaten.  The score is checked separately, since the evaluation
+      functions depend on it.
+
+      Each hash maps to one slot, holding (hash, score, remaining depth, value,
+      bound, best move, search number).  A new entry replaces the one in its
+      slot unless that one was stored by the current search and searched
+      deeper.  Bounds are EXACT, LOWER (the value is at least the one stored)
+      or UPPER (the value is at most the one stored).  The value of an entry
+      only holds for the depth it was searched to, but its best move is still
+      a good first move to try at other depths.
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.slots = [None] * size
+        self.random = random.Random(seed)
+        self.keys = {} # feature -> its random key
+        self.foodKeys = {} # id(food grid) -> (food grid, its key)
+        self.foodMaskKeys = {} # SearchState food bitmask -> its key
+        self.search = 0
+        self.probes, self.hits = 0, 0
+
+    def newSearch(self):
+        "Called before each move is searched: food grids of past moves are forgotten"
+        self.search += 1
+        self.foodKeys, self.foodMaskKeys = {}, {}
+
+    def featureKey(self, feature):
+        key = self.keys.get(feature)
+        if key is None:
+            key = self.keys[feature] = self.random.getrandbits(64)
+        return key
+
+    def foodKey(self, food):
+        # Successors get shallow copies of the food grid, which share its list of columns until a dot is eaten
+        entry = self.foodKeys.get(id(food.data))
+        if entry is None or entry[0] is not food.data:
+            key = 0
+            for cell in food.asList():
+                key ^= self.featureKey(('food', cell))
+            entry = self.foodKeys[id(food.data)] = (food.data, key)
+        return entry[1]
+
+    def key(self, gameState, agentIndex):
+        "Returns the (hash, score) pair that identifies a search node, a GameState or a SearchState"
+        if not hasattr(gameState, 'data'):
+            return self.searchStateKey(gameState, agentIndex)
+        data = gameState.data
+        key = self.foodKey(data.food) ^ self.featureKey(('turn', agentIndex))
+        for capsule in data.capsules:
+            key ^= self.featureKey(('capsule', capsule))
+        for index, agentState in enumerate(data.agentStates):
+            configuration = agentState.configuration
+            key ^= self.featureKey((index, configuration.pos, configuration.direction, agentState.scaredTimer))
+        return key, data.score
+
+    def searchStateKey(self, state, agentIndex):
+        key = self.foodMaskKeys.get(state.food)
+        if key is None:
+            key, food = 0, state.food
+            while food:
+                bit = food & -food
+                key ^= self.featureKey(('food', divmod(bit.bit_length() - 1, state.height)))
+                food ^= bit
+            self.foodMaskKeys[state.food] = key
+        key ^= self.featureKey(('turn', agentIndex))
+        for capsule in state.capsules:
+            key ^= self.featureKey(('capsule', capsule))
+        for index in range(len(state.positions)):
+            key ^= self.featureKey((index, state.positions[index], state.directions[index], state.scaredTimers[index]))
+        return key, state.score
+
+    def probe(self, key, remainingDepth):
+        """
+          Returns the (value, bound, move) stored for the node with this key, or
+          None.  The bound is None if the node was searched to another depth.
+        """
+        self.probes += 1
+        entry = self.slots[key[0] % self.size]
+        if entry is None or entry[0] != key[0] or entry[1] != key[1]:
+            return None
+        if entry[2] != remainingDepth:
+            return None, None, entry[5]
+        self.hits += 1
+        return entry[3:6]
+
+    def store(self, key, remainingDepth, value, bound, move):
+        index = key[0] % self.size
+        entry = self.slots[index]
+        if entry is None or entry[6] != self.search or entry[2] <= remainingDepth:
+            self.slots[index] = (key[0], key[1], remainingDepth, value, bound, move, self.search)
+
+def agentPosition(gameState, agentIndex):
+    "The position of Pacman or of a ghost"
+    if agentIndex == 0: return gameState.getPacmanPosition()
+    return gameState.getGhostPosition(agentIndex)
+
+class SearchTimeout(Exception):
+    "Raised to abandon a search that ran past its deadline (see MultiAgentSearchAgent.deepen)"
+    pass
+
 class MultiAgentSearchAgent(Agent):
     """
       This class provides some common elements to all of your
@@ -111,12 +224,99 @@ class MultiAgentSearchAgent(Agent):
       Note: this is an abstract class: one that should not be instantiated.  It's
       only partially specified, and designed to be extended.  Agent (game.py)
       is another abstract class.
+
+      With tableSize > 0 (e.g. -a depth=3,tableSize=100000), the searches
+      keep their results in a TranspositionTable of that many entries, shared
+      by all the moves of the game.
+
+      With timeBudget > 0 (e.g. -a timeBudget=0.2), the agents ignore depth and
+      deepen iteratively for that many seconds per move (see deepen).
+
+      With compactState=True, the agents search on a pacman.SearchState,
+      making and taking back moves in place, instead of generating a new
+      GameState at every node (see searchSuccessor).
+
+      With moveOrdering=True, AlphaBetaAgent orders the moves of every node
+      by killer moves, history and a static evaluation, so that it prunes
+      more (see AlphaBetaAgent.orderMoves).
     """
 
-    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2'):
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', tableSize = '0', timeBudget = '0',
+                 compactState = 'False', moveOrdering = 'False'):
         self.index = 0 # Pacman is always agent index 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
+        self.table = TranspositionTable(int(tableSize)) if int(tableSize) > 0 else None
+        self.timeBudget = float(timeBudget)
+        self.deadline, self.firstMove, self.completedDepth, self.cutoff = None, None, 0, False
+        self.compactState = compactState in [True, 'True']
+        self.moveOrdering = moveOrdering in [True, 'True']
+        self.history = util.Counter() # (agentIndex, position, action) -> weight of the cutoffs it caused
+        self.killers = {} # (depth, agentIndex) -> the last moves that caused a cutoff at that ply
+
+    def searchState(self, gameState):
+        "The state the search walks: gameState itself, or a SearchState copy of it with compactState"
+        return gameState.getSearchState() if self.compactState else gameState
+
+    def searchSuccessor(self, search, gameState, agentIndex, action, *args):
+        """
+          Returns search(successor, agentIndex + 1, *args), where the successor
+          is the state after the agent's action: a new GameState, or with
+          compactState the SearchState itself with the move made, which is
+          taken back once search returns, or raises (e.g. SearchTimeout).
+        """
+        if self.compactState:
+            gameState.makeMove(agentIndex, action)
+            try:
+                return search(gameState, agentIndex + 1, *args)
+            finally:
+                gameState.unmakeMove()
+        return search(gameState.generateSuccessor(agentIndex, action), agentIndex + 1, *args)
+
+    def deepen(self, search):
+        """
+          Anytime search: calls search(), which returns the best action at the
+          root for self.depth, with self.depth = 1, 2, ... until timeBudget
+          seconds have passed, and returns the action of the deepest search
+          that completed.  The search running at the deadline is abandoned, but
+          the depth 1 search always completes.  Deepening also stops once a
+          search reached no node at its depth limit, since deeper searches
+          would find the same.
+
+          AlphaBetaAgent searches the action of each depth first at the next
+          depth, and with a transposition table every node tries first the best
+          move it had at the previous depth.
+        """
+        maxDepth, action, completed = self.depth, None, 0
+        self.deadline, self.firstMove = time.time() + self.timeBudget, None
+        try:
+            while True:
+                self.depth, self.cutoff = completed + 1, False
+                action = self.firstMove = search()
+                completed = self.depth
+                if not self.cutoff: break
+        except SearchTimeout:
+            pass
+        finally:
+            self.depth, self.deadline, self.firstMove = maxDepth, None, None
+        self.completedDepth = completed
+        return action
+
+    def probe(self, key, depth):
+        """
+          Looks a node up in the transposition table.  A stored value may hide
+          nodes at the depth limit, so it counts as a depth cutoff.
+        """
+        entry = self.table.probe(key, self.depth - depth)
+        if entry and entry[1] is not None: self.cutoff = True
+        return entry
+
+    def checkDeadline(self, depth, actions):
+        "Called at every node of an anytime search: notes depth cutoffs and abandons the search at the deadline"
+        if depth == self.depth and actions:
+            self.cutoff = True
+        if self.depth > 1 and time.time() > self.deadline:
+            raise SearchTimeout()
 
 class MinimaxAgent(MultiAgentSearchAgent):
     """
@@ -143,6 +343,10 @@ class MinimaxAgent(MultiAgentSearchAgent):
 
         # Minimax function is called for agent=0 (pacman). The function returns both action and action_score,
         # but since 'getAction' only returns the action, the score is ignored.
+        if self.table: self.table.newSearch()
+        gameState = self.searchState(gameState)
+        if self.timeBudget:
+            return self.deepen(lambda: self.minimax(gameState, self.index, 0)[1])
         _, action = self.minimax(gameState, self.index, 0)
         return action
         
@@ -156,18 +360,27 @@ class MinimaxAgent(MultiAgentSearchAgent):
             depth -= -1
             
         actions = gameState.getLegalActions(agentIndex)
+        if self.deadline: self.checkDeadline(depth, actions)
         
         # When a 'terminal node' is reached or there are not legal actions available, the evaluationFunction implemented
         # on the first exercise is used as an utility function.
         if depth == self.depth or not actions:
             return self.evaluationFunction(gameState)
+
+        # A node already searched to the same depth has the same result.
+        if self.table:
+            key = self.table.key(gameState, agentIndex)
+            entry = self.probe(key, depth)
+            if entry and entry[1] == TranspositionTable.EXACT: return entry[0]
         
         # Pacman looks after maximizing its gain, so it will select the maximum scored action. At the same time, will try
         # to minimize the ghosts' gain.
         if agentIndex == 0:
-            return max([(self.minimax(gameState.generateSuccessor(agentIndex, i), agentIndex + 1, depth), i) for i in actions])
+            result = max([(self.searchSuccessor(self.minimax, gameState, agentIndex, i, depth), i) for i in actions])
         else:
-            return min([(self.minimax(gameState.generateSuccessor(agentIndex, i), agentIndex + 1, depth), i) for i in actions])
+            result = min([(self.searchSuccessor(self.minimax, gameState, agentIndex, i, depth), i) for i in actions])
+        if self.table: self.table.store(key, self.depth - depth, result, TranspositionTable.EXACT, result[1])
+        return result
         
 class AlphaBetaAgent(MultiAgentSearchAgent):
     """
@@ -179,6 +392,11 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
           Returns the minimax action using self.depth and self.evaluationFunction
         """
         # Same as the minimax call, except alpha and beta values on first call are -infinity and infinity respectively.
+        if self.table: self.table.newSearch()
+        if self.moveOrdering: self.newOrdering()
+        gameState = self.searchState(gameState)
+        if self.timeBudget:
+            return self.deepen(lambda: self.alphabeta_pruning(gameState, self.index, 0, float("-inf"), float("inf"))[1])
         _, action = self.alphabeta_pruning(gameState, self.index, 0, float("-inf"), float("inf"))
         return action
     
@@ -191,10 +409,80 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
             depth -= -1
             
         actions = gameState.getLegalActions(agentIndex)
+        if self.deadline: self.checkDeadline(depth, actions)
         
         if depth == self.depth or not actions:
             return self.evaluationFunction(gameState), None
-        
+
+        if self.moveOrdering: actions = self.orderMoves(gameState, agentIndex, depth, actions)
+
+        # In an anytime search the best move of the previous depth is searched first at the root.
+        if depth == 0 and agentIndex == self.index and self.firstMove in actions:
+            actions.remove(self.firstMove)
+            actions.insert(0, self.firstMove)
+
+        # A stored exact value is the result; a stored bound is enough if it is outside the window. Otherwise the
+        # best move stored is tried first, since it is the most likely to cause a cutoff again.
+        if self.table:
+            key = self.table.key(gameState, agentIndex)
+            entry = self.probe(key, depth)
+            if entry:
+                value, bound, move = entry
+                if bound == TranspositionTable.EXACT or (bound == TranspositionTable.LOWER and value > beta) or \
+                        (bound == TranspositionTable.UPPER and value < alpha):
+                    return value, move
+                if move in actions:
+                    actions.remove(move)
+                    actions.insert(0, move)
+            value, action = self.alphabeta_search(gameState, agentIndex, depth, alpha, beta, actions)
+            # Values outside the [alpha, beta] window were cut off, so they are only bounds.
+            if value > beta: bound = TranspositionTable.LOWER
+            elif value < alpha: bound = TranspositionTable.UPPER
+            else: bound = TranspositionTable.EXACT
+            self.table.store(key, self.depth - depth, value, bound, action)
+            return value, action
+        return self.alphabeta_search(gameState, agentIndex, depth, alpha, beta, actions)
+
+    def newOrdering(self):
+        "Called before each move is searched: killers are forgotten and the history of past moves is halved"
+        self.killers = {}
+        for move in self.history.keys():
+            self.history[move] /= 2
+            if not self.history[move]: del self.history[move]
+
+    def orderMoves(self, gameState, agentIndex, depth, actions):
+        """
+          Returns the actions in the order to search them: first the killer
+          moves of this ply, the moves that last caused a cutoff at the same
+          depth and turn; then the moves by their history, the cutoffs they
+          caused before from the same position, weighted by the depth left.
+          Moves tied on both are ordered by the evaluation of their
+          successor, best first for the agent moving, at the nodes more than
+          two depths above the limit: nearer to it, evaluating every
+          successor costs more time than the nodes it saves.
+        """
+        killers = self.killers.get((depth, agentIndex), ())
+        position = agentPosition(gameState, agentIndex)
+        sign = 1 if agentIndex == 0 else -1
+        if self.depth - depth > 2:
+            evaluate = lambda state, *args: self.evaluationFunction(state)
+            staticValue = lambda action: sign * self.searchSuccessor(evaluate, gameState, agentIndex, action)
+        else:
+            staticValue = lambda action: 0
+        return sorted(actions, reverse=True,
+                      key=lambda action: (action in killers, self.history[(agentIndex, position, action)],
+                                          staticValue(action)))
+
+    def noteCutoff(self, gameState, agentIndex, depth, action):
+        "Records that action caused a cutoff, as a killer move of its ply and in the history"
+        self.history[(agentIndex, agentPosition(gameState, agentIndex), action)] += 2 ** (self.depth - depth)
+        killers = self.killers.setdefault((depth, agentIndex), [])
+        if action not in killers:
+            killers.insert(0, action)
+            del killers[2:]
+
+    def alphabeta_search(self, gameState, agentIndex, depth, alpha, beta, actions):
+        "Searches the children of an inner node, in the order of 'actions'"
         if agentIndex == 0:
             
             # Initial values are -infinity and action 'None'.
@@ -203,7 +491,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
             # of multiple assignations and returns in the middle.
             for i in actions:
                 
-                nvalue, naction = self.alphabeta_pruning(gameState.generateSuccessor(agentIndex, i), agentIndex + 1, depth, alpha, beta)
+                nvalue, naction = self.searchSuccessor(self.alphabeta_pruning, gameState, agentIndex, i, depth, alpha, beta)
                 
                 # If the value has improved, it is kept. Here we're maximizing.
                 if nvalue > value:
@@ -211,6 +499,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
                 
                 # Pruning when value is bigger than beta.
                 if value > beta:
+                    if self.moveOrdering: self.noteCutoff(gameState, agentIndex, depth, action)
                     return value, action
                 
                 # Alpha will be always the maximum, so it's compared and updated with the new values.
@@ -223,7 +512,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
             value, action = float("inf"), None
             for i in actions:
                 
-                nvalue, naction = self.alphabeta_pruning(gameState.generateSuccessor(agentIndex, i), agentIndex + 1, depth, alpha, beta)
+                nvalue, naction = self.searchSuccessor(self.alphabeta_pruning, gameState, agentIndex, i, depth, alpha, beta)
                 
                 # If the value has improved, it is kept. Here we're minimizing.
                 if nvalue < value:
@@ -231,6 +520,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
                 
                 # Pruning when value is smaller than alpha.
                 if value < alpha:
+                    if self.moveOrdering: self.noteCutoff(gameState, agentIndex, depth, action)
                     return value, action
                 
                 # Beta will be always the minimum, so it's compared and updated with the new values.
@@ -252,6 +542,10 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
           legal moves.
         """
         # Same as the minimax call. The algorithm changes though.
+        if self.table: self.table.newSearch()
+        gameState = self.searchState(gameState)
+        if self.timeBudget:
+            return self.deepen(lambda: self.expectimax(gameState, self.index, 0)[1])
         _, action = self.expectimax(gameState, self.index, 0)
         return action
     
@@ -263,16 +557,28 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
             depth -= -1
         
         actions = gameState.getLegalActions(agentIndex)
+        if self.deadline: self.checkDeadline(depth, actions)
         
         if depth == self.depth or not actions:
             return self.evaluationFunction(gameState), None
 
+        if self.table:
+            key = self.table.key(gameState, agentIndex)
+            entry = self.probe(key, depth)
+            if entry and entry[1] == TranspositionTable.EXACT: return entry[0], entry[2]
+            value, action = self.expectimax_search(gameState, agentIndex, depth, actions)
+            self.table.store(key, self.depth - depth, value, TranspositionTable.EXACT, action)
+            return value, action
+        return self.expectimax_search(gameState, agentIndex, depth, actions)
+
+    def expectimax_search(self, gameState, agentIndex, depth, actions):
+        "Searches the children of an inner node"
         if agentIndex == 0:
             # The maximum gain will be the goal for agent Pacman. To achieve this, the maximum scored action will be 
             # returned.
             value, action = float("-inf"), None
             for i in actions:
-                nvalue, naction = self.expectimax(gameState.generateSuccessor(agentIndex, i), agentIndex + 1, depth)
+                nvalue, naction = self.searchSuccessor(self.expectimax, gameState, agentIndex, i, depth)
                 
                 if nvalue > value:
                     value, action = nvalue, i
@@ -282,7 +588,7 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
             # Ghosts here have a suboptimal behavior, what will imply a probability and a random chosen action. The
             # average of all 'scores' will be used as probability and a random action will be selected using the choice
             # function from the 'random' library.
-            values = [self.expectimax(gameState.generateSuccessor(agentIndex, i), agentIndex + 1, depth)[0] for i in actions]
+            values = [self.searchSuccessor(self.expectimax, gameState, agentIndex, i, depth)[0] for i in actions]
             # Returning the average it's the same as multiplying each score by it's probability (1/number_of_actions).
             return float(sum(values))/len(actions), random.choice(actions)
             
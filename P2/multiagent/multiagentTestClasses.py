@@ -167,8 +167,11 @@ class GradingAgent(Agent):
         random.seed(self.seed)
 
     def getAction(self, state):
-        GameState.getAndResetExplored()
-        studentAction = (self.studentAgent.getAction(state), len(GameState.getAndResetExplored()))
+        GameState.setExploredTracking(True)
+        try:
+            studentAction = (self.studentAgent.getAction(state), len(GameState.getAndResetExplored()))
+        finally:
+            GameState.setExploredTracking(False)
         optimalActions = self.optimalActions[self.stepCount]
         altDepthActions = self.altDepthActions[self.stepCount]
         partialPlyBugActions = self.partialPlyBugActions[self.stepCount]
@@ -269,10 +272,13 @@ class PolyAgent(Agent):
 
     def getAction(self, state):
         # survey agents
-        GameState.getAndResetExplored()
+        GameState.setExploredTracking(True)
         optimalActionLists = []
-        for agent in self.solutionAgents:
-            optimalActionLists.append((agent.getBestPacmanActions(state)[0], len(GameState.getAndResetExplored())))
+        try:
+            for agent in self.solutionAgents:
+                optimalActionLists.append((agent.getBestPacmanActions(state)[0], len(GameState.getAndResetExplored())))
+        finally:
+            GameState.setExploredTracking(False)
         alternativeDepthLists = [agent.getBestPacmanActions(state)[0] for agent in self.alternativeDepthAgents]
         partialPlyBugLists = [agent.getBestPacmanActions(state)[0] for agent in self.partialPlyBugAgents]
         # record responses
@@ -528,3 +534,85 @@ class EvalAgentTest(testClasses.TestCase):
 
 
 
+
+
+
+# The search method of each agent and its arguments after (gameState, agentIndex, depth)
+SEARCH_METHODS = {
+    'MinimaxAgent': ('minimax', ()),
+    'AlphaBetaAgent': ('alphabeta_pruning', (float('-inf'), float('inf'))),
+    'ExpectimaxAgent': ('expectimax', ()),
+}
+
+class SearchOptionsTest(testClasses.TestCase):
+    """
+      Checks that an agent searching with the options in agentArgs (e.g.
+      tableSize, compactState or moveOrdering) finds the same values as the
+      same agent without them.  Along a game where Pacman makes the moves of
+      the plain agent and the ghosts move at random, every legal move of
+      Pacman must get the same value from both agents, and the agent with the
+      options must choose a move of the best value: the plain agent's, or one
+      tied with it.  The agent with the options is kept for the whole game,
+      so that what it carries from one move to the next (the table, the
+      history) is tested too.
+    """
+
+    def __init__(self, question, testDict):
+        super(SearchOptionsTest, self).__init__(question, testDict)
+        self.alg = testDict['alg']
+        self.depth = testDict['depth']
+        self.evalFn = testDict.get('evalFn', 'scoreEvaluationFunction')
+        self.agentArgs = pacman.parseAgentArgs(testDict['agentArgs'])
+        self.seed = int(testDict['seed'])
+        self.moves = int(testDict['moves'])
+        self.layoutName = testDict['layoutName']
+        self.layoutText = testDict['layout']
+
+    def actionValues(self, agent, gameState):
+        "Searches each legal move of Pacman the way the agent's getAction does, and returns their values"
+        methodName, args = SEARCH_METHODS[self.alg]
+        values = {}
+        for action in gameState.getLegalActions(0):
+            value = agent.searchSuccessor(getattr(agent, methodName), agent.searchState(gameState), 0, action, 0, *args)
+            # Inner nodes return (value, action) pairs, and MinimaxAgent nests them
+            while isinstance(value, tuple):
+                value = value[0]
+            values[action] = value
+        return values
+
+    def execute(self, grades, moduleDict, solutionDict):
+        agentType = getattr(moduleDict['multiAgents'], self.alg)
+        plainAgent = agentType(evalFn=self.evalFn, depth=self.depth)
+        agent = agentType(evalFn=self.evalFn, depth=self.depth, **self.agentArgs)
+        ghostRandom = random.Random(self.seed)
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        gameState = GameState()
+        gameState.initialize(lay, lay.getNumGhosts())
+
+        for move in range(self.moves):
+            if gameState.isWin() or gameState.isLose(): break
+            plainAction = plainAgent.getAction(gameState)
+            action = agent.getAction(gameState)
+            plainValues = self.actionValues(plainAgent, gameState)
+            values = self.actionValues(agent, gameState)
+            wrongActions = [a for a in plainValues if abs(values[a] - plainValues[a]) > 1e-9]
+            if wrongActions or abs(plainValues[action] - plainValues[plainAction]) > 1e-9:
+                self.addMessage('Move %d on %s with %s:' % (move, self.layoutName, self.testDict['agentArgs']))
+                for a in wrongActions:
+                    self.addMessage('    %s has value %s, but %s without the options' % (a, values[a], plainValues[a]))
+                self.addMessage('    Chose %s of value %s, the plain search %s of value %s' %
+                                (action, plainValues[action], plainAction, plainValues[plainAction]))
+                self.addMessage('State:\n%s' % gameState)
+                return self.testFail(grades)
+            gameState = gameState.generateSuccessor(0, plainAction)
+            for ghostIndex in range(1, gameState.getNumAgents()):
+                if gameState.isWin() or gameState.isLose(): break
+                gameState = gameState.generateSuccessor(ghostIndex, ghostRandom.choice(gameState.getLegalActions(ghostIndex)))
+        return self.testPass(grades)
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# File intentionally blank.\n')
+        handle.close()
+        return True
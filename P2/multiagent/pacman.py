@@ -44,6 +44,9 @@ from game import GameStateData
 from game import Game
 from game import Directions
 from game import Actions
+from game import AgentState
+from game import Configuration
+from game import Grid
 from util import nearestPoint
 from util import manhattanDistance
 import util, layout
@@ -72,14 +75,24 @@ class GameState:
     # Accessor methods: use these to access state data #
     ####################################################
 
-    # static variable keeps track of which states have had getLegalActions called
+    # static variable keeps track of which states have had getLegalActions called.
+    # States are only recorded while trackExplored is on, which the autograder
+    # turns on around the moves it grades; hashing and keeping every generated
+    # state is too costly to do in normal games.
     explored = set()
+    trackExplored = False
     def getAndResetExplored():
         tmp = GameState.explored.copy()
         GameState.explored = set()
         return tmp
     getAndResetExplored = staticmethod(getAndResetExplored)
 
+    def setExploredTracking(enabled):
+        "Turns the recording of generated states on or off, and empties GameState.explored"
+        GameState.trackExplored = enabled
+        GameState.explored = set()
+    setExploredTracking = staticmethod(setExploredTracking)
+
     def getLegalActions( self, agentIndex=0 ):
         """
         Returns the legal actions for the agent specified.
@@ -121,8 +134,9 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
+        if GameState.trackExplored:
+            GameState.explored.add(self)
+            GameState.explored.add(state)
         return state
 
     def getLegalPacmanActions( self ):
@@ -134,6 +148,15 @@ class GameState:
         """
         return self.generateSuccessor( 0, action )
 
+    def getSearchState( self ):
+        """
+        Returns a SearchState copy of this state, for searches that make and
+        take back moves in place.  Agents get it from here rather than
+        importing pacman, which is __main__ when a game is run from the
+        command line and would be loaded a second time.
+        """
+        return SearchState( self )
+
     def getPacmanState( self ):
         """
         Returns an AgentState object for pacman (in game.py)
@@ -455,6 +478,204 @@ class GhostRules:
         ghostState.configuration = ghostState.start
     placeGhost = staticmethod( placeGhost )
 
+class SearchState:
+    """
+    A compact, mutable game state for game-tree search.  It holds only what
+    the rules need: the position, direction and scared timer of each agent,
+    the food as a bitmask (bit x * height + y), the capsules and the score.
+
+    makeMove(agentIndex, action) applies a legal move in place, with the same
+    rules as GameState.generateSuccessor (PacmanRules, GhostRules), and
+    unmakeMove() takes back the last move made, so a search can walk the
+    whole game tree on one object instead of allocating a GameState, its
+    AgentStates and possibly a food Grid at every node.  States it visits are
+    not added to GameState.explored.
+
+    It offers the GameState accessors that evaluation functions use.  Those
+    returning game objects (getFood, getGhostStates, ...) build them on
+    demand, so they are best called at the leaves only.
+    """
+
+    def __init__( self, gameState ):
+        data = gameState.data
+        self.walls = data.layout.walls
+        self.height = self.walls.height
+        self.positions = [agentState.configuration.pos for agentState in data.agentStates]
+        self.directions = [agentState.configuration.direction for agentState in data.agentStates]
+        self.scaredTimers = [agentState.scaredTimer for agentState in data.agentStates]
+        self.starts = [agentState.start for agentState in data.agentStates]
+        self.food, self.numFood = 0, 0
+        for x, y in data.food.asList():
+            self.food |= 1 << (x * self.height + y)
+            self.numFood += 1
+        self.capsules = list(data.capsules)
+        self.score = data.score
+        self.win, self.lose = data._win, data._lose
+        self.history = [] # What each move made changed, to take it back
+        self._moves = {} # (x, y) -> the directions possible from that cell, STOP included
+        self._ghostMoves = {} # ((x, y), direction) -> the legal ghost actions
+        self._foodGrids = {} # food bitmask -> Grid
+
+    def getLegalActions( self, agentIndex=0 ):
+        if self.win or self.lose: return []
+        x, y = self.positions[agentIndex]
+        cell = int(x + 0.5), int(y + 0.5)
+        if abs(x - cell[0]) + abs(y - cell[1]) > Actions.TOLERANCE:
+            # In between grid points, agents must continue straight
+            direction = self.directions[agentIndex]
+            return [] if agentIndex > 0 and direction == Directions.STOP else [direction]
+        if cell not in self._moves:
+            self._moves[cell] = Actions.getPossibleActions(Configuration(cell, Directions.STOP), self.walls)
+        if agentIndex == 0:
+            return list(self._moves[cell])
+        key = cell, self.directions[agentIndex]
+        if key not in self._ghostMoves:
+            actions = [action for action in self._moves[cell] if action != Directions.STOP]
+            reverse = Actions.reverseDirection(key[1])
+            if reverse in actions and len(actions) > 1:
+                actions.remove(reverse)
+            self._ghostMoves[key] = actions
+        return list(self._ghostMoves[key])
+
+    def makeMove( self, agentIndex, action ):
+        """
+        Applies a legal move of the agent, as GameState.generateSuccessor does.
+        """
+        if self.win or self.lose: raise Exception('Can\'t generate a successor of a terminal state.')
+        positions, scaredTimers = self.positions, self.scaredTimers
+        # (agent, position, direction, scared timer, score, win, lose, food, numFood, capsules, scaredTimers,
+        #  ghosts sent back to their start as (index, position, direction, scared timer))
+        self.history.append((agentIndex, positions[agentIndex], self.directions[agentIndex], scaredTimers[agentIndex],
+                             self.score, self.win, self.lose, self.food, self.numFood, self.capsules, scaredTimers, []))
+
+        if agentIndex == 0:
+            x, y = positions[0]
+            dx, dy = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
+            positions[0] = x + dx, y + dy
+            if action != Directions.STOP: self.directions[0] = action
+            # Eat food and capsules
+            nearest = nearestPoint(positions[0])
+            if manhattanDistance(nearest, positions[0]) <= 0.5:
+                bit = 1 << (nearest[0] * self.height + nearest[1])
+                if self.food & bit:
+                    self.food ^= bit
+                    self.numFood -= 1
+                    self.score += 10
+                    if self.numFood == 0 and not self.lose:
+                        self.score += 500
+                        self.win = True
+                if nearest in self.capsules:
+                    self.capsules = [capsule for capsule in self.capsules if capsule != nearest]
+                    self.scaredTimers = [scaredTimers[0]] + [SCARED_TIME] * (len(scaredTimers) - 1)
+            self.score -= TIME_PENALTY
+            for index in range(1, len(positions)):
+                self._checkDeath(index)
+        else:
+            speed = GhostRules.GHOST_SPEED
+            if scaredTimers[agentIndex] > 0: speed /= 2.0
+            x, y = positions[agentIndex]
+            dx, dy = Actions.directionToVector(action, speed)
+            positions[agentIndex] = x + dx, y + dy
+            self.directions[agentIndex] = Actions.vectorToDirection((dx, dy))
+            timer = scaredTimers[agentIndex]
+            if timer == 1:
+                positions[agentIndex] = nearestPoint(positions[agentIndex])
+            scaredTimers[agentIndex] = max(0, timer - 1)
+            self._checkDeath(agentIndex)
+
+    def _checkDeath( self, index ):
+        if manhattanDistance(self.positions[index], self.positions[0]) <= COLLISION_TOLERANCE:
+            if self.scaredTimers[index] > 0:
+                self.history[-1][-1].append((index, self.positions[index], self.directions[index], self.scaredTimers[index]))
+                self.score += 200
+                start = self.starts[index]
+                self.positions[index], self.directions[index] = start.pos, start.direction
+                self.scaredTimers[index] = 0
+            elif not self.win:
+                self.score -= 500
+                self.lose = True
+
+    def unmakeMove( self ):
+        "Takes back the last move made with makeMove"
+        record = self.history.pop()
+        # Ghosts sent back to their start were changed last, and on the timers the move ended with
+        for index, ghostPosition, ghostDirection, ghostTimer in reversed(record[-1]):
+            self.positions[index], self.directions[index] = ghostPosition, ghostDirection
+            self.scaredTimers[index] = ghostTimer
+        agentIndex, position, direction, timer, self.score, self.win, self.lose, self.food, self.numFood, \
+            self.capsules, self.scaredTimers, _ = record
+        self.positions[agentIndex], self.directions[agentIndex] = position, direction
+        self.scaredTimers[agentIndex] = timer
+
+    # Accessors, as in GameState
+
+    def getNumAgents( self ):
+        return len(self.positions)
+
+    def getScore( self ):
+        return float(self.score)
+
+    def isWin( self ):
+        return self.win
+
+    def isLose( self ):
+        return self.lose
+
+    def getLegalPacmanActions( self ):
+        return self.getLegalActions(0)
+
+    def getPacmanPosition( self ):
+        return self.positions[0]
+
+    def getGhostPosition( self, agentIndex ):
+        if agentIndex == 0:
+            raise Exception("Pacman's index passed to getGhostPosition")
+        return self.positions[agentIndex]
+
+    def getGhostPositions( self ):
+        return self.positions[1:]
+
+    def getPacmanState( self ):
+        return self._agentState(0)
+
+    def getGhostState( self, agentIndex ):
+        if agentIndex == 0 or agentIndex >= self.getNumAgents():
+            raise Exception("Invalid index passed to getGhostState")
+        return self._agentState(agentIndex)
+
+    def getGhostStates( self ):
+        return [self._agentState(index) for index in range(1, len(self.positions))]
+
+    def _agentState( self, index ):
+        agentState = AgentState(self.starts[index], index == 0)
+        agentState.configuration = Configuration(self.positions[index], self.directions[index])
+        agentState.scaredTimer = self.scaredTimers[index]
+        return agentState
+
+    def getCapsules( self ):
+        return self.capsules
+
+    def getNumFood( self ):
+        return self.numFood
+
+    def hasFood( self, x, y ):
+        return self.food >> (x * self.height + y) & 1 == 1
+
+    def getFood( self ):
+        if self.food not in self._foodGrids:
+            food = Grid(self.walls.width, self.height)
+            for x in range(food.width):
+                for y in range(self.height):
+                    food[x][y] = self.hasFood(x, y)
+            self._foodGrids[self.food] = food
+        return self._foodGrids[self.food]
+
+    def getWalls( self ):
+        return self.walls
+
+    def hasWall( self, x, y ):
+        return self.walls[x][y]
+
 #############################
 # FRAMEWORK TO START A GAME #
 #############################
@@ -15,6 +15,7 @@
 "Feature extractors for Pacman game states"
 
 from game import Directions, Actions
+import mazeDistances
 import util
 
 class FeatureExtractor:
@@ -43,25 +44,14 @@ class CoordinateExtractor(FeatureExtractor):
 
 def closestFood(pos, food, walls):
     """
-    closestFood -- this is similar to the function that we have
-    worked on in the search project; here its all in one place
+    closestFood -- the maze distance from pos to the closest food, read from
+    the precomputed distance table of the layout (see mazeDistances.py)
     """
-    fringe = [(pos[0], pos[1], 0)]
-    expanded = set()
-    while fringe:
-        pos_x, pos_y, dist = fringe.pop(0)
-        if (pos_x, pos_y) in expanded:
-            continue
-        expanded.add((pos_x, pos_y))
-        # if we find a food at this location then exit
-        if food[pos_x][pos_y]:
-            return dist
-        # otherwise spread out from the location to its neighbours
-        nbrs = Actions.getLegalNeighbors((pos_x, pos_y), walls)
-        for nbr_x, nbr_y in nbrs:
-            fringe.append((nbr_x, nbr_y, dist+1))
-    # no food found
-    return None
+    closest = mazeDistances.getMazeDistances(walls).getClosest(pos, food)
+    if closest is None:
+        # no food found
+        return None
+    return closest[0]
 
 class SimpleExtractor(FeatureExtractor):
     """
@@ -71,14 +71,24 @@ class GameState:
     # Accessor methods: use these to access state data #
     ####################################################
 
-    # static variable keeps track of which states have had getLegalActions called
+    # static variable keeps track of which states have had getLegalActions called.
+    # States are only recorded while trackExplored is on, which the autograder
+    # turns on around the moves it grades; hashing and keeping every generated
+    # state is too costly to do in normal games.
     explored = set()
+    trackExplored = False
     def getAndResetExplored():
         tmp = GameState.explored.copy()
         GameState.explored = set()
         return tmp
     getAndResetExplored = staticmethod(getAndResetExplored)
 
+    def setExploredTracking(enabled):
+        "Turns the recording of generated states on or off, and empties GameState.explored"
+        GameState.trackExplored = enabled
+        GameState.explored = set()
+    setExploredTracking = staticmethod(setExploredTracking)
+
     def getLegalActions( self, agentIndex=0 ):
         """
         Returns the legal actions for the agent specified.
@@ -120,8 +130,9 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
+        if GameState.trackExplored:
+            GameState.explored.add(self)
+            GameState.explored.add(state)
         return state
 
     def getLegalPacmanActions( self ):
@@ -15,7 +15,10 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque
 import cStringIO
+import cPickle
+import os
 
 
 class FixedRandom:
@@ -135,25 +138,33 @@ class Stack:
         return len(self.list) == 0
 
 class Queue:
-    "A container with a first-in-first-out (FIFO) queuing policy."
+    """
+    A container with a first-in-first-out (FIFO) queuing policy.
+
+    Items are kept in a deque, so pushing and popping take constant time
+    (inserting at the front of a list would copy the whole queue on every push).
+    """
     def __init__(self):
-        self.list = []
+        self.list = deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
@@ -577,6 +588,36 @@ def pause():
     print "<Press enter/return to continue>"
     raw_input()
 
+def loadPickle(fileName):
+    """
+    Returns the object pickled in fileName, or None if the file is missing
+    or cannot be unpickled.  Goes with savePickle for caches on disk.
+    """
+    try:
+        f = open(fileName, 'rb')
+    except IOError:
+        return None
+    try: return cPickle.load(f)
+    except Exception: return None # A corrupt or outdated cache file is simply rebuilt
+    finally: f.close()
+
+def savePickle(fileName, obj):
+    """
+    Pickles obj to fileName, creating its directory if needed.  The file is
+    written under a temporary name and renamed, so concurrent readers never
+    see a partial file.  Failures are ignored: a cache is an optimization only.
+    """
+    try:
+        directory = os.path.dirname(fileName)
+        if directory and not os.path.isdir(directory): os.makedirs(directory)
+        tmpName = '%s.%d.tmp' % (fileName, os.getpid())
+        f = open(tmpName, 'wb')
+        try: cPickle.dump(obj, f, cPickle.HIGHEST_PROTOCOL)
+        finally: f.close()
+        os.rename(tmpName, fileName)
+    except (IOError, OSError):
+        pass
+
 
 # code to handle timeouts
 #